@@ -1,11 +1,19 @@
 # file: agents/compliance.py
+import re
 from pathlib import Path
 from app.schema import Prospect
 from app.config import (
-    COMPANY_FOOTER_PATH, ENABLE_CAN_SPAM, 
-    ENABLE_PECR, ENABLE_CASL
+    COMPANY_FOOTER_PATH, ENABLE_CAN_SPAM, ENABLE_CASL
 )
 
+# Unverifiable claims, reported in this order
+FORBIDDEN_PHRASES = (
+    "guaranteed", "100%", "no risk", "best in the world",
+    "revolutionary", "breakthrough"
+)
+# One alternation scan over the body instead of a pass per phrase
+_FORBIDDEN_RE = re.compile("|".join(re.escape(p) for p in FORBIDDEN_PHRASES))
+
 class Compliance:
     """Enforces email compliance and policies"""
     
@@ -31,50 +39,53 @@ class Compliance:
         
         policy_failures = []
         
-        # Check suppression
+        # Check suppression; all lookups go to the store in one batched request
+        checks = []
+        seen_domains = set()
         for contact in prospect.contacts:
-            if await self.store.check_suppression("email", contact.email):
-                policy_failures.append(f"Email suppressed: {contact.email}")
+            checks.append(("email", contact.email, f"Email suppressed: {contact.email}"))
             
+            # Contacts usually share the company domain; look each domain up once
             domain = contact.email.split("@")[1]
-            if await self.store.check_suppression("domain", domain):
-                policy_failures.append(f"Domain suppressed: {domain}")
+            if domain not in seen_domains:
+                seen_domains.add(domain)
+                checks.append(("domain", domain, f"Domain suppressed: {domain}"))
         
-        if await self.store.check_suppression("company", prospect.company.id):
-            policy_failures.append(f"Company suppressed: {prospect.company.name}")
+        checks.append(("company", prospect.company.id, f"Company suppressed: {prospect.company.name}"))
+        
+        suppressed = await self.store.check_suppressions(
+            [(type, value) for type, value, _ in checks]
+        )
+        policy_failures.extend(
+            reason for (_, _, reason), hit in zip(checks, suppressed) if hit
+        )
         
         # Check content requirements
         body = prospect.email_draft.get("body", "")
+        # Case-fold once for every phrase check below
+        lowered = body.lower()
         
         # CAN-SPAM requirements
         if ENABLE_CAN_SPAM:
-            if "unsubscribe" not in body.lower() and "unsubscribe" not in self.footer.lower():
+            if "unsubscribe" not in lowered and "unsubscribe" not in self.footer.lower():
                 policy_failures.append("CAN-SPAM: Missing unsubscribe mechanism")
             
             if not any(addr in self.footer for addr in ["St", "Ave", "Rd", "Blvd"]):
                 policy_failures.append("CAN-SPAM: Missing physical postal address")
         
         # PECR requirements (UK)
-        if ENABLE_PECR:
-            # Check for soft opt-in or existing relationship
-            # In production, would check CRM for prior relationship
-            if "existing customer" not in body.lower():
-                # For demo, we'll be lenient
-                pass
+        # Soft opt-in / existing relationship would be checked against the CRM in
+        # production; the demo is lenient, so there is nothing to scan for yet
         
-        # CASL requirements (Canada)
+        # CASL requirements (Canada); cheap domain test before scanning the body
         if ENABLE_CASL:
-            if "consent" not in body.lower() and prospect.company.domain.endswith(".ca"):
+            if prospect.company.domain.endswith(".ca") and "consent" not in lowered:
                 policy_failures.append("CASL: May need express consent for Canadian recipients")
         
         # Check for unverifiable claims
-        forbidden_phrases = [
-            "guaranteed", "100%", "no risk", "best in the world",
-            "revolutionary", "breakthrough"
-        ]
-        
-        for phrase in forbidden_phrases:
-            if phrase in body.lower():
+        found = set(_FORBIDDEN_RE.findall(lowered))
+        for phrase in FORBIDDEN_PHRASES:
+            if phrase in found:
                 policy_failures.append(f"Unverifiable claim: '{phrase}'")
         
         # Append footer to email
@@ -3,6 +3,41 @@ from email_validator import validate_email, EmailNotValidError
 from app.schema import Prospect, Contact
 import uuid
 import re
+from functools import lru_cache
+
+_NON_NAME_CHARS = re.compile(r"[^a-zA-Z\s]")
+
+# Mock names per title to avoid placeholders
+NAME_POOL = {
+    "CEO": ["Emma Johnson", "Michael Chen", "Ava Thompson", "Liam Garcia"],
+    "Head of Customer Success": ["Daniel Kim", "Priya Singh", "Ethan Brown", "Maya Davis"],
+    "VP Customer Experience": ["Olivia Martinez", "Noah Patel", "Sophia Lee", "Jackson Rivera"],
+    "Director of CX": ["Henry Walker", "Isabella Nguyen", "Lucas Adams", "Chloe Wilson"],
+    "Chief Customer Officer": ["Amelia Clark", "James Wright", "Mila Turner", "Benjamin Scott"],
+    "SVP Customer Success": ["Charlotte King", "William Brooks", "Zoe Parker", "Logan Hughes"],
+    "VP CX Analytics": ["Harper Bell", "Elijah Foster", "Layla Reed", "Oliver Evans"],
+}
+
+def pick_name(company_id: str, title: str) -> str:
+    pool = NAME_POOL.get(title, ["Alex Morgan"])  # fallback
+    # Stable index by company id + title
+    key = f"{company_id}:{title}"
+    idx = sum(ord(c) for c in key) % len(pool)
+    return pool[idx]
+
+@lru_cache(maxsize=1024)
+def email_from_name(name: str, domain: str) -> str:
+    """Build a validated email for a name; cached since validation is pure and comparatively slow"""
+    parts = _NON_NAME_CHARS.sub("", name).strip().lower().split()
+    if len(parts) >= 2:
+        prefix = f"{parts[0]}.{parts[-1]}"
+    else:
+        prefix = parts[0]
+    email = f"{prefix}@{domain}"
+    try:
+        return validate_email(email, check_deliverability=False).normalized
+    except EmailNotValidError:
+        return f"contact@{domain}"
 
 class Contactor:
     """Generates and validates contacts with deduplication"""
@@ -43,39 +78,9 @@ class Contactor:
         for contact in existing:
             seen_emails.add(contact.email.lower())
         
-        # Mock names per title to avoid placeholders
-        name_pool = {
-            "CEO": ["Emma Johnson", "Michael Chen", "Ava Thompson", "Liam Garcia"],
-            "Head of Customer Success": ["Daniel Kim", "Priya Singh", "Ethan Brown", "Maya Davis"],
-            "VP Customer Experience": ["Olivia Martinez", "Noah Patel", "Sophia Lee", "Jackson Rivera"],
-            "Director of CX": ["Henry Walker", "Isabella Nguyen", "Lucas Adams", "Chloe Wilson"],
-            "Chief Customer Officer": ["Amelia Clark", "James Wright", "Mila Turner", "Benjamin Scott"],
-            "SVP Customer Success": ["Charlotte King", "William Brooks", "Zoe Parker", "Logan Hughes"],
-            "VP CX Analytics": ["Harper Bell", "Elijah Foster", "Layla Reed", "Oliver Evans"],
-        }
-
-        def pick_name(title: str) -> str:
-            pool = name_pool.get(title, ["Alex Morgan"])  # fallback
-            # Stable index by company id + title
-            key = f"{prospect.company.id}:{title}"
-            idx = sum(ord(c) for c in key) % len(pool)
-            return pool[idx]
-
-        def email_from_name(name: str, domain: str) -> str:
-            parts = re.sub(r"[^a-zA-Z\s]", "", name).strip().lower().split()
-            if len(parts) >= 2:
-                prefix = f"{parts[0]}.{parts[-1]}"
-            else:
-                prefix = parts[0]
-            email = f"{prefix}@{domain}"
-            try:
-                return validate_email(email, check_deliverability=False).normalized
-            except EmailNotValidError:
-                return f"contact@{domain}"
-
         for title in titles:
             # Create mock contact
-            full_name = pick_name(title)
+            full_name = pick_name(prospect.company.id, title)
             email = email_from_name(full_name, prospect.company.domain)
             
             # Dedupe
@@ -1,4 +1,5 @@
 # file: agents/curator.py
+import asyncio
 from datetime import datetime
 from app.schema import Prospect, HandoffPacket
 
@@ -14,13 +15,11 @@ class Curator:
     async def run(self, prospect: Prospect) -> Prospect:
         """Create handoff packet"""
         
-        # Get thread
-        thread = None
-        if prospect.thread_id:
-            thread = await self.email_client.get_thread(prospect.id)
-        
-        # Get calendar slots
-        slots = await self.calendar_client.suggest_slots()
+        # Get thread and calendar slots concurrently
+        thread, slots = await asyncio.gather(
+            self._get_thread(prospect),
+            self.calendar_client.suggest_slots()
+        )
         
         # Create packet
         packet = HandoffPacket(
@@ -37,4 +36,10 @@ class Curator:
         prospect.status = "ready_for_handoff"
         await self.store.save_prospect(prospect)
         
-        return prospect
\ No newline at end of file
+        return prospect
+    
+    async def _get_thread(self, prospect: Prospect):
+        """Fetch the prospect's email thread, if one was created"""
+        if not prospect.thread_id:
+            return None
+        return await self.email_client.get_thread(prospect.id)
\ No newline at end of file
@@ -1,9 +1,30 @@
 # file: agents/enricher.py
+import asyncio
 from datetime import datetime
+from functools import lru_cache
 from app.schema import Prospect, Fact
 from app.config import FACT_TTL_HOURS
 import uuid
 
+# Search queries issued per company; formatted with Company fields
+_QUERY_TEMPLATES = (
+    "{name} customer experience",
+    "{name} {industry} challenges",
+    "{domain} support contact",
+)
+
+@lru_cache(maxsize=1024)
+def build_queries(name: str, industry: str, domain: str) -> tuple:
+    """Format the search queries for a company (cached; companies recur across runs)"""
+    return tuple(
+        t.format(name=name, industry=industry, domain=domain)
+        for t in _QUERY_TEMPLATES
+    )
+
+def _dedupe_key(text: str) -> str:
+    """Normalize a snippet so case and whitespace variants compare equal"""
+    return " ".join(text.casefold().split())
+
 class Enricher:
     """Enriches prospects with facts from search"""
     
@@ -16,18 +37,23 @@ class Enricher:
         """Enrich prospect with facts"""
         
         # Search for company information
-        queries = [
-            f"{prospect.company.name} customer experience",
-            f"{prospect.company.name} {prospect.company.industry} challenges",
-            f"{prospect.company.domain} support contact"
-        ]
+        company = prospect.company
+        queries = build_queries(company.name, company.industry, company.domain)
         
         facts = []
+        seen_texts = set()
         
-        for query in queries:
-            results = await self.search.query(query)
-            
+        # Queries are independent; issue them concurrently, results stay in query order
+        all_results = await asyncio.gather(*(self.search.query(q) for q in queries))
+        
+        for results in all_results:
             for result in results[:2]:  # Top 2 per query
+                # Overlapping queries often return the same snippet; keep the first
+                key = _dedupe_key(result["text"])
+                if key in seen_texts:
+                    continue
+                seen_texts.add(key)
+                
                 fact = Fact(
                     id=str(uuid.uuid4()),
                     source=result["source"],
@@ -38,7 +64,6 @@ class Enricher:
                     company_id=prospect.company.id
                 )
                 facts.append(fact)
-                await self.store.save_fact(fact)
         
         # Add company pain points as facts
         for pain in prospect.company.pains:
@@ -52,7 +77,10 @@ class Enricher:
                 company_id=prospect.company.id
             )
             facts.append(fact)
-            await self.store.save_fact(fact)
+        
+        # Persist all facts in one store round-trip
+        if facts:
+            await self.store.save_facts(facts)
         
         prospect.facts = facts
         prospect.status = "enriched"
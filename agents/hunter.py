@@ -4,29 +4,40 @@ from typing import List, Optional
 from app.schema import Company, Prospect
 from app.config import COMPANIES_FILE
 
+def load_companies() -> List[Company]:
+    """Load and validate seed companies"""
+    with open(COMPANIES_FILE) as f:
+        return [Company.model_validate(c) for c in json.load(f)]
+
 class Hunter:
     """Loads seed companies and creates prospects"""
     
     def __init__(self, mcp_registry):
         self.mcp = mcp_registry
         self.store = mcp_registry.get_store_client()
+        self._by_id = None  # company id -> Company, loaded on first run
+    
+    def reload(self):
+        """Drop the cached seed index so the next run re-reads the seed file"""
+        self._by_id = None
     
     async def run(self, company_ids: Optional[List[str]] = None) -> List[Prospect]:
         """Load companies and create prospects"""
         
-        # Load from seed file
-        with open(COMPANIES_FILE) as f:
-            companies_data = json.load(f)
+        # Load from seed file once; later runs reuse the index
+        if self._by_id is None:
+            self._by_id = {c.id: c for c in load_companies()}
+        
+        if company_ids:
+            # Set membership per seed company; keeps seed-file order, as before
+            wanted = set(company_ids)
+            companies = [c for cid, c in self._by_id.items() if cid in wanted]
+        else:
+            companies = list(self._by_id.values())
         
         prospects = []
         
-        for company_data in companies_data:
-            # Filter by IDs if specified
-            if company_ids and company_data["id"] not in company_ids:
-                continue
-            
-            company = Company(**company_data)
-            
+        for company in companies:
             # Create prospect
             prospect = Prospect(
                 id=company.id,
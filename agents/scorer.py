@@ -1,7 +1,10 @@
 # file: agents/scorer.py
 from datetime import datetime, timedelta
-from app.schema import Prospect
-from app.config import MIN_FIT_SCORE
+from app.schema import Prospect, Company
+from app.config import MIN_FIT_SCORE, PRESCORE_MIN
+
+# Most that fact freshness (0.2) and fact confidence (0.2) can add to a score
+MAX_FACT_SCORE = 0.4
 
 class Scorer:
     """Scores prospects and drops low-quality ones"""
@@ -10,22 +13,22 @@ class Scorer:
         self.mcp = mcp_registry
         self.store = mcp_registry.get_store_client()
     
-    async def run(self, prospect: Prospect) -> Prospect:
-        """Score prospect based on various factors"""
+    def _company_score(self, company: Company) -> float:
+        """Score the parts of fit that depend only on company fields"""
         
         score = 0.0
         
         # Industry scoring
         high_value_industries = ["SaaS", "FinTech", "E-commerce", "Healthcare Tech"]
-        if prospect.company.industry in high_value_industries:
+        if company.industry in high_value_industries:
             score += 0.3
         else:
             score += 0.1
         
         # Size scoring
-        if 100 <= prospect.company.size <= 5000:
+        if 100 <= company.size <= 5000:
             score += 0.2  # Sweet spot
-        elif prospect.company.size > 5000:
+        elif company.size > 5000:
             score += 0.1  # Enterprise, harder to sell
         else:
             score += 0.05  # Too small
@@ -33,11 +36,37 @@ class Scorer:
         # Pain points alignment
         cx_related_pains = ["customer retention", "NPS", "support efficiency", "personalization"]
         matching_pains = sum(
-            1 for pain in prospect.company.pains 
+            1 for pain in company.pains 
             if any(keyword in pain.lower() for keyword in cx_related_pains)
         )
         score += min(0.3, matching_pains * 0.1)
         
+        return score
+    
+    async def prescore(self, prospect: Prospect) -> Prospect:
+        """Drop prospects whose company fields alone rule them out, before enrichment"""
+        
+        company_score = self._company_score(prospect.company)
+        ceiling = min(1.0, company_score + MAX_FACT_SCORE)
+        
+        # fit_score is left alone: neither number is the prospect's real score
+        if company_score < PRESCORE_MIN:
+            prospect.status = "dropped"
+            prospect.dropped_reason = f"Low company fit: {company_score:.2f}"
+        elif ceiling < MIN_FIT_SCORE:
+            prospect.status = "dropped"
+            prospect.dropped_reason = f"Low fit score ceiling: {ceiling:.2f}"
+        else:
+            return prospect
+        
+        await self.store.save_prospect(prospect)
+        return prospect
+    
+    async def run(self, prospect: Prospect) -> Prospect:
+        """Score prospect based on various factors"""
+        
+        score = self._company_score(prospect.company)
+        
         # Facts freshness
         fresh_facts = 0
         stale_facts = 0
@@ -1,13 +1,25 @@
 # file: agents/writer.py
-import json
+import asyncio
+import orjson
 import re
 import aiohttp
 from typing import AsyncGenerator
 from app.schema import Prospect
-from app.config import OLLAMA_BASE_URL, MODEL_NAME
+from app.config import OLLAMA_BASE_URL, MODEL_NAME, OLLAMA_KEEP_ALIVE
 from app.logging_utils import log_event
 from vector.retriever import Retriever
 
+_GENERATE_URL = f"{OLLAMA_BASE_URL}/api/generate"
+
+# Only this many retrieved facts make it into the prompt
+PROMPT_FACTS = 3
+
+# Bracketed placeholders the model leaves in drafts, e.g. [Team Name]
+_PLACEHOLDER = re.compile(r"\[[^\]]+\]")
+# "Subject: ... Body: ..." layout requested in the email prompt; any preamble before
+# Subject: is ignored and everything after the first Body: is the body
+_EMAIL_PARTS = re.compile(r"Subject:(.*?)Body:(.*)", re.DOTALL)
+
 class Writer:
     """Generates outreach content with Ollama streaming"""
     
@@ -15,13 +27,25 @@ class Writer:
         self.mcp = mcp_registry
         self.store = mcp_registry.get_store_client()
         self.retriever = Retriever()
+        self.session = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the Ollama HTTP session on first use"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        return self.session
+    
+    async def close(self):
+        """Close the Ollama HTTP session"""
+        if self.session:
+            await self.session.close()
     
     async def run_streaming(self, prospect: Prospect) -> AsyncGenerator[dict, None]:
         """Generate content with streaming tokens"""
         
-        # Get relevant facts from vector store
+        # Get relevant facts from vector store (embedding + FAISS search block, so run off-loop)
         try:
-            relevant_facts = self.retriever.retrieve(prospect.company.id, k=5)
+            relevant_facts = await asyncio.to_thread(self.retriever.retrieve, prospect.company.id, PROMPT_FACTS)
         except:
             relevant_facts = []
         
@@ -40,7 +64,7 @@ BUSINESS CONTEXT:
 {chr(10).join(f'• {note}' for note in prospect.company.notes) if prospect.company.notes else '• No additional notes'}
 
 RELEVANT INSIGHTS:
-{chr(10).join(f'• {fact["text"]} (confidence: {fact.get("score", 0.7):.2f})' for fact in relevant_facts[:3]) if relevant_facts else '• Industry best practices suggest focusing on customer experience improvements'}
+{chr(10).join(f'• {fact["text"]} (confidence: {fact.get("score", 0.7):.2f})' for fact in relevant_facts[:PROMPT_FACTS]) if relevant_facts else '• Industry best practices suggest focusing on customer experience improvements'}
 """
         
         # Generate comprehensive summary first
@@ -55,7 +79,7 @@ Generate a comprehensive bullet-point summary for {prospect.company.name} that i
 Format: Use 5-7 bullets, each starting with "•". Be specific and actionable.
 Include the industry and size context in your summary."""
         
-        summary_text = ""
+        summary_tokens = []  # joined once the stream ends
         
         # Emit company header first
         yield log_event("writer", f"Generating content for {prospect.company.name}", "company_start", 
@@ -63,125 +87,59 @@ Include the industry and size context in your summary."""
                         "industry": prospect.company.industry,
                         "size": prospect.company.size})
         
-        async with aiohttp.ClientSession() as session:
-            # Summary generation
-            try:
-                async with session.post(
-                    f"{OLLAMA_BASE_URL}/api/generate",
-                    json={
-                        "model": MODEL_NAME,
-                        "prompt": summary_prompt,
-                        "stream": True,
-                        "think": False
+        # Persistent session so the Ollama connection is reused across generations and prospects
+        session = await self._get_session()
+        # Summary generation
+        try:
+            async for token in self._stream_generate(session, summary_prompt):
+                summary_tokens.append(token)
+                yield log_event(
+                    "writer",
+                    token,
+                    "llm_token",
+                    {
+                        "type": "summary",
+                        "token": token,
+                        "prospect_id": prospect.id,
+                        "company_id": prospect.company.id,
+                        "company_name": prospect.company.name,
                     },
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    async for line in response.content:
-                        if line:
-                            try:
-                                chunk = json.loads(line)
-                                if "response" in chunk:
-                                    token = chunk["response"]
-                                    summary_text += token
-                                    yield log_event(
-                                        "writer",
-                                        token,
-                                        "llm_token",
-                                        {
-                                            "type": "summary",
-                                            "token": token,
-                                            "prospect_id": prospect.id,
-                                            "company_id": prospect.company.id,
-                                            "company_name": prospect.company.name,
-                                        },
-                                    )
-                                
-                                if chunk.get("done", False):
-                                    break
-                            except json.JSONDecodeError:
-                                continue
-            except Exception as e:
-                summary_text = f"""• {prospect.company.name} is a {prospect.company.industry} company with {prospect.company.size} employees
+                )
+            summary_text = "".join(summary_tokens)
+        except Exception as e:
+            summary_text = f"""• {prospect.company.name} is a {prospect.company.industry} company with {prospect.company.size} employees
 • Main challenge: {prospect.company.pains[0] if prospect.company.pains else 'Customer experience improvement'}
 • Opportunity: Implement modern CX solutions to improve customer satisfaction
 • Recommended action: Schedule a consultation to discuss specific needs"""
-                yield log_event("writer", f"Summary generation failed, using default: {e}", "llm_error")
+            yield log_event("writer", f"Summary generation failed, using default: {e}", "llm_error")
         
         # Generate personalized email
-        # If we have a contact, instruct the greeting explicitly
-        greeting_hint = ""
-        if prospect.contacts:
-            first = (prospect.contacts[0].name or "").split()[0]
-            if first:
-                greeting_hint = f"Use this greeting exactly at the start: 'Hi {first},'\n"
-
-        email_prompt = f"""{context}
-
-Company Summary:
-{summary_text}
-
-Write a personalized outreach email from Lucidya to leaders at {prospect.company.name}.
-{greeting_hint}
-Requirements:
-- Subject line that mentions their company name and industry
-- Body: 150-180 words, professional and friendly
-- Make it clear the sender is Lucidya (use "we" and "our" as Lucidya)
-- Reference their specific industry ({prospect.company.industry}) and size ({prospect.company.size} employees)
-- Clearly connect their challenges to Lucidya's capabilities
-- One clear call-to-action to schedule a short conversation or demo next week
-- Do not write as if the email is from the company to Lucidya
-- No exaggerated claims
-- Sign off as: "The Lucidya Team"
-
-Format response exactly as:
-Subject: [subject line]
-Body: [email body]
-"""
+        email_prompt = self._email_prompt(prospect, context, summary_text)
         
-        email_text = ""
+        email_tokens = []  # joined once the stream ends
         
         # Emit email generation start
         yield log_event("writer", f"Generating email for {prospect.company.name}", "email_start",
                        {"company": prospect.company.name})
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{OLLAMA_BASE_URL}/api/generate",
-                    json={
-                        "model": MODEL_NAME,
-                        "prompt": email_prompt,
-                        "stream": True,
-                        "think": False
+        try:
+            async for token in self._stream_generate(session, email_prompt):
+                email_tokens.append(token)
+                yield log_event(
+                    "writer",
+                    token,
+                    "llm_token",
+                    {
+                        "type": "email",
+                        "token": token,
+                        "prospect_id": prospect.id,
+                        "company_id": prospect.company.id,
+                        "company_name": prospect.company.name,
                     },
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    async for line in response.content:
-                        if line:
-                            try:
-                                chunk = json.loads(line)
-                                if "response" in chunk:
-                                    token = chunk["response"]
-                                    email_text += token
-                                    yield log_event(
-                                        "writer",
-                                        token,
-                                        "llm_token",
-                                        {
-                                            "type": "email",
-                                            "token": token,
-                                            "prospect_id": prospect.id,
-                                            "company_id": prospect.company.id,
-                                            "company_name": prospect.company.name,
-                                        },
-                                    )
-                                
-                                if chunk.get("done", False):
-                                    break
-                            except json.JSONDecodeError:
-                                continue
-            except Exception as e:
-                email_text = f"""Subject: Improve {prospect.company.name}'s Customer Experience
+                )
+            email_text = "".join(email_tokens)
+        except Exception as e:
+            email_text = f"""Subject: Improve {prospect.company.name}'s Customer Experience
 
 Body: Dear {prospect.company.name} team,
 
@@ -193,14 +151,14 @@ Would you be available for a brief call next week to explore how we can address
 
 Best regards,
 Lucidya Team"""
-                yield log_event("writer", f"Email generation failed, using default: {e}", "llm_error")
+            yield log_event("writer", f"Email generation failed, using default: {e}", "llm_error")
         
         # Parse email
         email_parts = {"subject": "", "body": ""}
-        if "Subject:" in email_text and "Body:" in email_text:
-            parts = email_text.split("Body:")
-            email_parts["subject"] = parts[0].replace("Subject:", "").strip()
-            email_parts["body"] = parts[1].strip()
+        match = _EMAIL_PARTS.search(email_text)
+        if match:
+            email_parts["subject"] = match.group(1).strip()
+            email_parts["body"] = match.group(2).strip()
         else:
             # Fallback with company details
             email_parts["subject"] = f"Transform {prospect.company.name}'s Customer Experience"
@@ -217,9 +175,9 @@ Lucidya Team"""
         if prospect.contacts:
             contact_name = prospect.contacts[0].name
             if email_parts.get("subject"):
-                email_parts["subject"] = re.sub(r"\[[^\]]+\]", contact_name, email_parts["subject"])
+                email_parts["subject"] = _PLACEHOLDER.sub(contact_name, email_parts["subject"])
             if email_parts.get("body"):
-                email_parts["body"] = re.sub(r"\[[^\]]+\]", contact_name, email_parts["body"])
+                email_parts["body"] = _PLACEHOLDER.sub(contact_name, email_parts["body"])
 
         # Update prospect
         prospect.summary = f"**{prospect.company.name} ({prospect.company.industry}, {prospect.company.size} employees)**\n\n{summary_text}"
@@ -242,6 +200,78 @@ Lucidya Team"""
             },
         )
     
+    async def _stream_generate(self, session, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream response tokens from Ollama's NDJSON /api/generate output"""
+        async with session.post(
+            _GENERATE_URL,
+            json={
+                "model": MODEL_NAME,
+                "prompt": prompt,
+                "stream": True,
+                "think": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE
+            },
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            # Read whatever bytes arrived and split complete lines ourselves,
+            # rather than awaiting the stream reader once per line
+            buffer = b""
+            async for data in response.content.iter_any():
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    try:
+                        chunk = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if "response" in chunk:
+                        yield chunk["response"]
+                    if chunk.get("done", False):
+                        return
+            
+            # Final line without a trailing newline
+            if buffer.strip():
+                try:
+                    chunk = orjson.loads(buffer)
+                except orjson.JSONDecodeError:
+                    return
+                if "response" in chunk:
+                    yield chunk["response"]
+    
+    def _email_prompt(self, prospect: Prospect, context: str, summary_text: str) -> str:
+        """Build the outreach email prompt from company context and summary"""
+        # If we have a contact, instruct the greeting explicitly
+        greeting_hint = ""
+        if prospect.contacts:
+            first = (prospect.contacts[0].name or "").split()[0]
+            if first:
+                greeting_hint = f"Use this greeting exactly at the start: 'Hi {first},'\n"
+
+        return f"""{context}
+
+Company Summary:
+{summary_text}
+
+Write a personalized outreach email from Lucidya to leaders at {prospect.company.name}.
+{greeting_hint}
+Requirements:
+- Subject line that mentions their company name and industry
+- Body: 150-180 words, professional and friendly
+- Make it clear the sender is Lucidya (use "we" and "our" as Lucidya)
+- Reference their specific industry ({prospect.company.industry}) and size ({prospect.company.size} employees)
+- Clearly connect their challenges to Lucidya's capabilities
+- One clear call-to-action to schedule a short conversation or demo next week
+- Do not write as if the email is from the company to Lucidya
+- No exaggerated claims
+- Sign off as: "The Lucidya Team"
+
+Format response exactly as:
+Subject: [subject line]
+Body: [email body]
+"""
+    
     async def run(self, prospect: Prospect) -> Prospect:
         """Non-streaming version for compatibility"""
         async for event in self.run_streaming(prospect):
@@ -12,17 +12,30 @@ DATA_DIR = BASE_DIR / "data"
 # Ollama
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 MODEL_NAME = os.getenv("MODEL_NAME", "qwen3:0.6b")
+# How long Ollama keeps the model loaded after a request (Ollama's default is 5m)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
 
 # Vector Store
 VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", str(DATA_DIR / "faiss.index"))
+# "flat" (exact), "hnsw" (approximate, sublinear search) or "sq8" (int8-quantized, 4x smaller)
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat").lower()
+HNSW_M = int(os.getenv("HNSW_M", "32"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 EMBEDDING_DIM = 384
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# On-disk embedding cache; set to an empty string to disable
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", str(DATA_DIR / "embeddings.db"))
 
 # MCP Servers
 MCP_SEARCH_PORT = int(os.getenv("MCP_SEARCH_PORT", "9001"))
 MCP_EMAIL_PORT = int(os.getenv("MCP_EMAIL_PORT", "9002"))
 MCP_CALENDAR_PORT = int(os.getenv("MCP_CALENDAR_PORT", "9003"))
 MCP_STORE_PORT = int(os.getenv("MCP_STORE_PORT", "9004"))
+# Seconds search results are reused for repeated queries (0 disables)
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "3600"))
+# Most distinct queries kept; least recently used are evicted first
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
 
 # Compliance
 COMPANY_FOOTER_PATH = os.getenv("COMPANY_FOOTER_PATH", str(DATA_DIR / "footer.txt"))
@@ -32,6 +45,8 @@ ENABLE_CASL = os.getenv("ENABLE_CASL", "true").lower() == "true"
 
 # Scoring
 MIN_FIT_SCORE = float(os.getenv("MIN_FIT_SCORE", "0.5"))
+# Company-fields-only cutoff applied before enrichment (industry + size + pains, 0.15-0.8)
+PRESCORE_MIN = float(os.getenv("PRESCORE_MIN", "0.2"))
 FACT_TTL_HOURS = int(os.getenv("FACT_TTL_HOURS", "168"))  # 1 week
 
 # Data Files
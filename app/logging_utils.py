@@ -13,9 +13,9 @@ def setup_logging(level=logging.INFO):
     )
 
 def log_event(agent: str, message: str, type: str = "agent_log", payload: dict = None) -> dict:
-    """Create a pipeline event for streaming"""
+    """Create a pipeline event for streaming (ts is ISO-formatted when encoded)"""
     return {
-        "ts": datetime.utcnow().isoformat(),
+        "ts": datetime.utcnow(),
         "type": type,
         "agent": agent,
         "message": message,
@@ -1,16 +1,17 @@
 # file: app/main.py
-import json
+import asyncio
 from datetime import datetime
 from typing import AsyncGenerator
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import StreamingResponse, JSONResponse
-from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
 from app.schema import PipelineRequest, WriterStreamRequest, Prospect, HandoffPacket
 from app.orchestrator import Orchestrator
-from app.config import OLLAMA_BASE_URL, MODEL_NAME
+from app.config import OLLAMA_BASE_URL, MODEL_NAME, OLLAMA_KEEP_ALIVE
 from app.logging_utils import setup_logging
 from mcp.registry import MCPRegistry
-from vector.store import VectorStore
+from vector.embeddings import get_embedding_model
 import requests
 
 setup_logging()
@@ -18,12 +19,50 @@ setup_logging()
 app = FastAPI(title="Lucidya MCP Prototype", version="0.1.0")
 orchestrator = Orchestrator()
 mcp = MCPRegistry()
-vector_store = VectorStore()
+# The Writer's retriever store, so /reset rebuilds the index that /run and /writer/stream search
+vector_store = orchestrator.writer.retriever.store
+# Pooled keep-alive connection for the Ollama health probe
+ollama_http = requests.Session()
 
 @app.on_event("startup")
 async def startup():
     """Initialize connections on startup"""
     await mcp.connect()
+    # Warm models in the background so the first pipeline run doesn't pay cold-start latency
+    # Keep a reference: the loop only holds tasks weakly
+    app.state.warmup_task = asyncio.create_task(warm_models())
+
+async def warm_models():
+    """Load the embedding model and preload the Ollama model"""
+    try:
+        await asyncio.to_thread(get_embedding_model().encode, ["warm up"])
+    except Exception as e:
+        print(f"Warning: Embedding warm-up failed: {e}")
+    
+    try:
+        # A generate request without a prompt just loads the model
+        await asyncio.to_thread(
+            ollama_http.post,
+            f"{OLLAMA_BASE_URL}/api/generate",
+            json={"model": MODEL_NAME, "keep_alive": OLLAMA_KEEP_ALIVE},
+            timeout=60
+        )
+    except Exception as e:
+        print(f"Warning: Ollama preload failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the model warm-up and close persistent HTTP sessions"""
+    warmup = getattr(app.state, "warmup_task", None)
+    if warmup and not warmup.done():
+        warmup.cancel()
+        try:
+            await warmup
+        except asyncio.CancelledError:
+            pass
+    await orchestrator.writer.close()
+    await orchestrator.mcp.close()
+    await mcp.close()
 
 @app.get("/health")
 async def health():
@@ -32,7 +71,7 @@ async def health():
         # Check Ollama
         ollama_ok = False
         try:
-            resp = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=2)
+            resp = await asyncio.to_thread(ollama_http.get, f"{OLLAMA_BASE_URL}/api/tags", timeout=2)
             ollama_ok = resp.status_code == 200
         except:
             pass
@@ -57,11 +96,20 @@ async def health():
             content={"status": "unhealthy", "error": str(e)}
         )
 
+def _json_default(obj):
+    """Serialize nested Pydantic models (e.g., Prospect) inside event payloads"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError
+
+def encode_event(event: dict) -> bytes:
+    """Encode a pipeline event as a single NDJSON line"""
+    return orjson.dumps(event, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+
 async def stream_pipeline(request: PipelineRequest) -> AsyncGenerator[bytes, None]:
     """Stream NDJSON events from pipeline"""
     async for event in orchestrator.run_pipeline(request.company_ids):
-        # Ensure nested Pydantic models (e.g., Prospect) are JSON-serializable
-        yield (json.dumps(jsonable_encoder(event)) + "\n").encode()
+        yield encode_event(event)
 
 @app.post("/run")
 async def run_pipeline(request: PipelineRequest):
@@ -73,14 +121,12 @@ async def run_pipeline(request: PipelineRequest):
 
 async def stream_writer_test(company_id: str) -> AsyncGenerator[bytes, None]:
     """Stream only Writer agent output for testing"""
-    from agents.writer import Writer
-    
     # Get company from store
     store = mcp.get_store_client()
     company = await store.get_company(company_id)
     
     if not company:
-        yield (json.dumps({"error": f"Company {company_id} not found"}) + "\n").encode()
+        yield encode_event({"error": f"Company {company_id} not found"})
         return
     
     # Create a test prospect
@@ -93,10 +139,9 @@ async def stream_writer_test(company_id: str) -> AsyncGenerator[bytes, None]:
         status="scored"
     )
     
-    writer = Writer(mcp)
-    async for event in writer.run_streaming(prospect):
-        # Ensure nested Pydantic models (e.g., Prospect) are JSON-serializable
-        yield (json.dumps(jsonable_encoder(event)) + "\n").encode()
+    # Reuse the orchestrator's Writer so its retriever, index and query-embedding cache persist
+    async for event in orchestrator.writer.run_streaming(prospect):
+        yield encode_event(event)
 
 @app.post("/writer/stream")
 async def writer_stream_test(request: WriterStreamRequest):
@@ -142,8 +187,8 @@ async def get_prospect(prospect_id: str):
         thread = await email_client.get_thread(prospect.id)
     
     return {
-        "prospect": prospect.dict(),
-        "thread": thread.dict() if thread else None
+        "prospect": prospect.model_dump(),
+        "thread": thread
     }
 
 @app.get("/handoff/{prospect_id}")
@@ -176,7 +221,7 @@ async def get_handoff(prospect_id: str):
         generated_at=datetime.utcnow()
     )
     
-    return packet.dict()
+    return packet.model_dump()
 
 @app.post("/reset")
 async def reset_system():
@@ -195,9 +240,10 @@ async def reset_system():
     
     for company_data in companies:
         await store.save_company(company_data)
+    orchestrator.hunter.reload()
     
-    # Rebuild vector index
-    vector_store.rebuild_index()
+    # Rebuild vector index (re-embeds every seed text, so keep it off the event loop)
+    await asyncio.to_thread(vector_store.rebuild_index)
     
     return {
         "status": "reset_complete",
@@ -207,4 +253,5 @@ async def reset_system():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # "auto" picks uvloop when it is installed, falling back to asyncio
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto")
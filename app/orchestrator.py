@@ -40,6 +40,14 @@ class Orchestrator:
             try:
                 company_name = prospect.company.name
                 
+                # Cheap pre-score on company fields before spending enrich/contact calls
+                prospect = await self.scorer.prescore(prospect)
+                
+                if prospect.status == "dropped":
+                    yield log_event("scorer", f"Dropped: {prospect.dropped_reason}", "agent_log",
+                                   {"reason": prospect.dropped_reason})
+                    continue
+                
                 # Enricher phase
                 yield log_event("enricher", f"Enriching {company_name}", "agent_start")
                 yield log_event("enricher", f"Calling MCP Search for company facts", "mcp_call",
@@ -123,9 +131,11 @@ class Orchestrator:
                 yield log_event("compliance", "Calling MCP Store to check email/domain suppressions", "mcp_call",
                                {"mcp_server": "store", "method": "check_suppression"})
                 
-                # Check each contact for suppression
-                for contact in prospect.contacts:
-                    email_suppressed = await store.check_suppression("email", contact.email)
+                # Check each contact for suppression (lookups are independent, run them together)
+                email_checks = await asyncio.gather(*(
+                    store.check_suppression("email", contact.email) for contact in prospect.contacts
+                ))
+                for contact, email_suppressed in zip(prospect.contacts, email_checks):
                     if email_suppressed:
                         yield log_event("compliance", f"Email {contact.email} is suppressed", "mcp_response",
                                        {"mcp_server": "store", "suppressed": True})
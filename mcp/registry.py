@@ -1,50 +1,88 @@
 # file: mcp/registry.py
 import asyncio
+import time
 import aiohttp
+import orjson
+from collections import OrderedDict
 from typing import Dict, Any
 from fastapi.encoders import jsonable_encoder
 from app.config import (
     MCP_SEARCH_PORT, MCP_EMAIL_PORT, 
-    MCP_CALENDAR_PORT, MCP_STORE_PORT
+    MCP_CALENDAR_PORT, MCP_STORE_PORT, SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE
 )
 
 class MCPClient:
     """Base MCP client for server communication"""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, registry=None):
         self.base_url = base_url
+        self.registry = registry  # when set, its shared session is used
         self.session = None
     
     async def connect(self):
         """Initialize connection"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed:
+            if self.registry:
+                self.session = await self.registry.get_session()
+            else:
+                self.session = aiohttp.ClientSession()
     
     async def close(self):
-        """Close connection"""
-        if self.session:
+        """Close connection (a shared session is closed by its registry)"""
+        if self.session and not self.registry:
             await self.session.close()
     
-    async def call(self, method: str, params: Dict[str, Any] = None):
-        """Call MCP method"""
-        if not self.session:
+    async def _post(self, payload):
+        """POST an RPC payload and return the decoded reply"""
+        if self.session is None or self.session.closed:
             await self.connect()
-        # Ensure payload is JSON-serializable (handles datetimes and Pydantic models)
-        payload = {"method": method, "params": params or {}}
-        safe_payload = jsonable_encoder(payload)
-
+        # orjson handles datetimes natively; jsonable_encoder only covers what it can't (e.g. Pydantic models)
+        body = orjson.dumps(payload, default=jsonable_encoder)
+        
         async with self.session.post(
             f"{self.base_url}/rpc",
-            json=safe_payload
+            data=body,
+            headers={"Content-Type": "application/json"}
         ) as response:
-            result = await response.json()
-            return result.get("result")
+            return orjson.loads(await response.read())
+    
+    async def call(self, method: str, params: Dict[str, Any] = None):
+        """Call MCP method"""
+        result = await self._post({"method": method, "params": params or {}})
+        return result.get("result")
+    
+    async def call_batch(self, calls):
+        """Call several MCP methods in one request; results are returned in call order"""
+        replies = await self._post([
+            {"id": i, "method": method, "params": params or {}}
+            for i, (method, params) in enumerate(calls)
+        ])
+        
+        by_id = {reply.get("id"): reply.get("result") for reply in replies}
+        return [by_id.get(i) for i in range(len(calls))]
 
 class SearchClient(MCPClient):
-    """Search MCP client"""
+    """Search MCP client with a bounded LRU/TTL cache of query results"""
+    
+    def __init__(self, base_url: str, registry=None):
+        super().__init__(base_url, registry)
+        self._cache = OrderedDict()  # q -> (results, fetched_at), oldest use first
     
     async def query(self, q: str):
-        return await self.call("search.query", {"q": q})
+        cached = self._cache.get(q)
+        if cached:
+            if time.time() - cached[1] < SEARCH_CACHE_TTL:
+                self._cache.move_to_end(q)
+                return cached[0]
+            del self._cache[q]
+        
+        results = await self.call("search.query", {"q": q})
+        # Error replies come back as None; don't pin a transient failure for the TTL
+        if SEARCH_CACHE_TTL > 0 and isinstance(results, list):
+            self._cache[q] = (results, time.time())
+            if len(self._cache) > SEARCH_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return results
 
 class EmailClient(MCPClient):
     """Email MCP client"""
@@ -74,18 +112,18 @@ class StoreClient(MCPClient):
     """Store MCP client"""
     
     async def save_prospect(self, prospect):
-        return await self.call("store.save_prospect", {"prospect": prospect.dict()})
+        return await self.call("store.save_prospect", {"prospect": prospect.model_dump(mode="json")})
     
     async def get_prospect(self, prospect_id: str):
         result = await self.call("store.get_prospect", {"id": prospect_id})
         if result:
             from app.schema import Prospect
-            return Prospect(**result)
+            return Prospect.model_validate(result)
     
     async def list_prospects(self):
         results = await self.call("store.list_prospects")
         from app.schema import Prospect
-        return [Prospect(**p) for p in results]
+        return [Prospect.model_validate(p) for p in results]
     
     async def save_company(self, company):
         return await self.call("store.save_company", {"company": company})
@@ -94,24 +132,34 @@ class StoreClient(MCPClient):
         result = await self.call("store.get_company", {"id": company_id})
         if result:
             from app.schema import Company
-            return Company(**result)
+            return Company.model_validate(result)
     
     async def save_fact(self, fact):
-        return await self.call("store.save_fact", {"fact": fact.dict()})
+        return await self.call("store.save_fact", {"fact": fact.model_dump(mode="json")})
+    
+    async def save_facts(self, facts):
+        return await self.call("store.save_facts", {"facts": [f.model_dump(mode="json") for f in facts]})
     
     async def save_contact(self, contact):
-        return await self.call("store.save_contact", {"contact": contact.dict()})
+        return await self.call("store.save_contact", {"contact": contact.model_dump(mode="json")})
     
     async def list_contacts_by_domain(self, domain: str):
         results = await self.call("store.list_contacts_by_domain", {"domain": domain})
         from app.schema import Contact
-        return [Contact(**c) for c in results]
+        return [Contact.model_validate(c) for c in results]
     
     async def check_suppression(self, type: str, value: str):
         return await self.call("store.check_suppression", {"type": type, "value": value})
     
+    async def check_suppressions(self, checks):
+        """Check several (type, value) pairs in one batched request"""
+        return await self.call_batch([
+            ("store.check_suppression", {"type": type, "value": value})
+            for type, value in checks
+        ])
+    
     async def save_handoff(self, packet):
-        return await self.call("store.save_handoff", {"packet": packet.dict()})
+        return await self.call("store.save_handoff", {"packet": packet.model_dump(mode="json")})
     
     async def clear_all(self):
         return await self.call("store.clear_all")
@@ -120,10 +168,19 @@ class MCPRegistry:
     """Central registry for all MCP clients"""
     
     def __init__(self):
-        self.search = SearchClient(f"http://localhost:{MCP_SEARCH_PORT}")
-        self.email = EmailClient(f"http://localhost:{MCP_EMAIL_PORT}")
-        self.calendar = CalendarClient(f"http://localhost:{MCP_CALENDAR_PORT}")
-        self.store = StoreClient(f"http://localhost:{MCP_STORE_PORT}")
+        self.session = None
+        self.search = SearchClient(f"http://localhost:{MCP_SEARCH_PORT}", self)
+        self.email = EmailClient(f"http://localhost:{MCP_EMAIL_PORT}", self)
+        self.calendar = CalendarClient(f"http://localhost:{MCP_CALENDAR_PORT}", self)
+        self.store = StoreClient(f"http://localhost:{MCP_STORE_PORT}", self)
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """One keep-alive connection pool shared by all MCP clients"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, keepalive_timeout=60)
+            )
+        return self.session
     
     async def connect(self):
         """Connect all clients"""
@@ -132,21 +189,32 @@ class MCPRegistry:
         await self.calendar.connect()
         await self.store.connect()
     
+    async def close(self):
+        """Close the shared session"""
+        if self.session:
+            await self.session.close()
+    
     async def health_check(self):
         """Check health of all MCP servers"""
-        status = {}
-        
-        for name, client in [
+        clients = [
             ("search", self.search),
             ("email", self.email),
             ("calendar", self.calendar),
             ("store", self.store)
-        ]:
-            try:
-                await client.call("health")
+        ]
+        
+        # Servers are independent; probe them concurrently
+        results = await asyncio.gather(
+            *(client.call("health") for _, client in clients),
+            return_exceptions=True
+        )
+        
+        status = {}
+        for (name, _), result in zip(clients, results):
+            if isinstance(result, Exception):
+                status[name] = f"unhealthy: {str(result)}"
+            else:
                 status[name] = "healthy"
-            except Exception as e:
-                status[name] = f"unhealthy: {str(e)}"
         
         return status
     
@@ -1,19 +1,26 @@
 # file: mcp/servers/calendar_server.py
 #!/usr/bin/env python3
-import json
+import re
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 from aiohttp import web
 
+# Allow running as a script (python mcp/servers/<name>.py) with repo-root imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from mcp.servers.rpc import rpc_handler, run_server
+
+# Characters dropped from ISO timestamps to get ICS basic format
+_ICS_STRIP = re.compile(r"[-:.]")
+
 class CalendarServer:
     """Calendar MCP server"""
     
-    async def handle_rpc(self, request):
-        data = await request.json()
-        method = data.get("method")
-        params = data.get("params", {})
+    async def dispatch(self, method: str, params: dict) -> dict:
+        """Handle one RPC call and return its response payload"""
         
         if method == "health":
-            return web.json_response({"result": "ok"})
+            return {"result": "ok"}
         
         elif method == "calendar.suggest_slots":
             # Generate slots for next week
@@ -27,7 +34,7 @@ class CalendarServer:
                     "end_iso": (slot_time + timedelta(minutes=30)).isoformat()
                 })
             
-            return web.json_response({"result": slots})
+            return {"result": slots}
         
         elif method == "calendar.generate_ics":
             summary = params["summary"]
@@ -39,19 +46,19 @@ VERSION:2.0
 PRODID:-//Lucidya//MCP//EN
 BEGIN:VEVENT
 SUMMARY:{summary}
-DTSTART:{start.replace('-', '').replace(':', '').replace('.', '')}
-DTEND:{end.replace('-', '').replace(':', '').replace('.', '')}
+DTSTART:{_ICS_STRIP.sub("", start)}
+DTEND:{_ICS_STRIP.sub("", end)}
 DESCRIPTION:Discuss customer experience improvements
 END:VEVENT
 END:VCALENDAR"""
             
-            return web.json_response({"result": ics})
+            return {"result": ics}
         
-        return web.json_response({"error": "Unknown method"}, status=400)
+        return {"error": "Unknown method"}
 
 app = web.Application()
 server = CalendarServer()
-app.router.add_post("/rpc", server.handle_rpc)
+app.router.add_post("/rpc", rpc_handler(server.dispatch))
 
 if __name__ == "__main__":
-    web.run_app(app, port=9003)
\ No newline at end of file
+    run_server(app, 9003)
\ No newline at end of file
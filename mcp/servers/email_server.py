@@ -1,24 +1,31 @@
 # file: mcp/servers/email_server.py
 #!/usr/bin/env python3
-import json
+import sys
 import uuid
+from collections import defaultdict
 from datetime import datetime
+from pathlib import Path
 from aiohttp import web
 
+# Allow running as a script (python mcp/servers/<name>.py) with repo-root imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from mcp.servers.rpc import rpc_handler, run_server
+
 class EmailServer:
     """Email MCP server"""
     
     def __init__(self):
         self.threads = {}
         self.messages = []
+        # prospect_id -> messages / first thread id, so lookups don't scan everything
+        self.by_prospect = defaultdict(list)
+        self.thread_by_prospect = {}
     
-    async def handle_rpc(self, request):
-        data = await request.json()
-        method = data.get("method")
-        params = data.get("params", {})
+    async def dispatch(self, method: str, params: dict) -> dict:
+        """Handle one RPC call and return its response payload"""
         
         if method == "health":
-            return web.json_response({"result": "ok"})
+            return {"result": "ok"}
         
         elif method == "email.send":
             # Create message
@@ -40,6 +47,7 @@ class EmailServer:
             }
             
             self.messages.append(message)
+            self.by_prospect[prospect_id].append(message)
             
             if thread_id not in self.threads:
                 self.threads[thread_id] = {
@@ -48,52 +56,50 @@ class EmailServer:
                     "messages": []
                 }
             self.threads[thread_id]["messages"].append(message)
+            self.thread_by_prospect.setdefault(prospect_id, thread_id)
             
-            return web.json_response({
+            return {
                 "result": {
                     "thread_id": thread_id,
                     "message_id": message_id,
                     "prospect_id": prospect_id
                 }
-            })
+            }
         
         elif method == "email.thread":
             prospect_id = params.get("prospect_id")
             
             # Find thread for prospect
-            for thread_id, thread_data in self.threads.items():
-                if thread_data.get("prospect_id") == prospect_id:
-                    return web.json_response({
-                        "result": {
-                            "id": thread_id,
-                            "prospect_id": prospect_id,
-                            "messages": thread_data["messages"]
-                        }
-                    })
+            thread_id = self.thread_by_prospect.get(prospect_id)
+            if thread_id:
+                return {
+                    "result": {
+                        "id": thread_id,
+                        "prospect_id": prospect_id,
+                        "messages": self.threads[thread_id]["messages"]
+                    }
+                }
             
-            # Fallback to searching messages
-            prospect_messages = [
-                m for m in self.messages 
-                if m.get("prospect_id") == prospect_id
-            ]
+            # Fallback to the prospect's messages
+            prospect_messages = self.by_prospect.get(prospect_id, [])
             
             if prospect_messages:
                 thread_id = prospect_messages[0]["thread_id"]
-                return web.json_response({
+                return {
                     "result": {
                         "id": thread_id,
                         "prospect_id": prospect_id,
                         "messages": prospect_messages
                     }
-                })
+                }
             
-            return web.json_response({"result": None})
+            return {"result": None}
         
-        return web.json_response({"error": "Unknown method"}, status=400)
+        return {"error": "Unknown method"}
 
 app = web.Application()
 server = EmailServer()
-app.router.add_post("/rpc", server.handle_rpc)
+app.router.add_post("/rpc", rpc_handler(server.dispatch))
 
 if __name__ == "__main__":
-    web.run_app(app, port=9002)
\ No newline at end of file
+    run_server(app, 9002)
\ No newline at end of file
@@ -0,0 +1,52 @@
+# file: mcp/servers/rpc.py
+"""JSON-RPC plumbing shared by the MCP servers (orjson instead of the stdlib json)"""
+import orjson
+from aiohttp import web
+
+async def read_json(request: web.Request):
+    """Decode the request body straight from bytes"""
+    return orjson.loads(await request.read())
+
+def json_response(data, status: int = 200) -> web.Response:
+    """Drop-in for web.json_response backed by orjson"""
+    return web.Response(body=orjson.dumps(data), status=status, content_type="application/json")
+
+def _tag_reply(call_id, reply) -> bytes:
+    """Encode one batch reply with its call id"""
+    if isinstance(reply, bytes):
+        # Pre-serialized '{...}' object: splice the id in after the opening brace
+        return b'{"id":' + orjson.dumps(call_id) + b"," + reply[1:]
+    return orjson.dumps({"id": call_id, **reply})
+
+def rpc_handler(dispatch):
+    """Build the /rpc route for a server's dispatch(method, params) -> payload
+    
+    dispatch returns a payload dict, or bytes of an already-serialized
+    payload object. A JSON array body is a batch: each call is dispatched in
+    order and the replies come back as one array, each tagged with its id.
+    """
+    async def handle(request: web.Request) -> web.Response:
+        data = await read_json(request)
+        
+        if isinstance(data, list):
+            replies = []
+            for call in data:
+                reply = await dispatch(call.get("method"), call.get("params", {}))
+                replies.append(_tag_reply(call.get("id"), reply))
+            return web.Response(body=b"[" + b",".join(replies) + b"]", content_type="application/json")
+        
+        reply = await dispatch(data.get("method"), data.get("params", {}))
+        if isinstance(reply, bytes):
+            return web.Response(body=reply, content_type="application/json")
+        return json_response(reply, status=400 if "error" in reply else 200)
+    
+    return handle
+
+def run_server(app: web.Application, port: int):
+    """Run an MCP server on uvloop when available, without per-request access logs"""
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    web.run_app(app, port=port, access_log=None)
\ No newline at end of file
@@ -1,46 +1,47 @@
 # file: mcp/servers/search_server.py
 #!/usr/bin/env python3
-import json
+import sys
+import orjson
 from datetime import datetime
+from pathlib import Path
 from aiohttp import web
 
+# Allow running as a script (python mcp/servers/<name>.py) with repo-root imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from mcp.servers.rpc import rpc_handler, run_server
+
+# search.query reply as bytes; only the query and timestamp vary per call
+_QUERY_REPLY = (
+    b'{"result":['
+    b'{"text":"Found that %b is a critical priority for modern businesses",'
+    b'"source":"Industry Report 2024","ts":"%b","confidence":0.85},'
+    b'{"text":"Best practices for %b include automation and personalization",'
+    b'"source":"CX Weekly","ts":"%b","confidence":0.75}'
+    b']}'
+)
+
 class SearchServer:
     """Mock search MCP server"""
     
-    async def handle_rpc(self, request):
-        data = await request.json()
-        method = data.get("method")
-        params = data.get("params", {})
+    async def dispatch(self, method: str, params: dict):
+        """Handle one RPC call and return its response payload"""
         
         if method == "health":
-            return web.json_response({"result": "ok"})
+            return {"result": "ok"}
         
         elif method == "search.query":
             q = params.get("q", "")
             
-            # Mock search results
-            results = [
-                {
-                    "text": f"Found that {q} is a critical priority for modern businesses",
-                    "source": "Industry Report 2024",
-                    "ts": datetime.utcnow().isoformat(),
-                    "confidence": 0.85
-                },
-                {
-                    "text": f"Best practices for {q} include automation and personalization",
-                    "source": "CX Weekly",
-                    "ts": datetime.utcnow().isoformat(),
-                    "confidence": 0.75
-                }
-            ]
-            
-            return web.json_response({"result": results})
+            # Mock search results, spliced into the pre-serialized reply
+            qb = orjson.dumps(q)[1:-1]  # JSON-escaped, without the quotes
+            ts = datetime.utcnow().isoformat().encode()
+            return _QUERY_REPLY % (qb, ts, qb, ts)
         
-        return web.json_response({"error": "Unknown method"}, status=400)
+        return {"error": "Unknown method"}
 
 app = web.Application()
 server = SearchServer()
-app.router.add_post("/rpc", server.handle_rpc)
+app.router.add_post("/rpc", rpc_handler(server.dispatch))
 
 if __name__ == "__main__":
-    web.run_app(app, port=9001)
\ No newline at end of file
+    run_server(app, 9001)
\ No newline at end of file
@@ -1,14 +1,33 @@
 # file: mcp/servers/store_server.py
 #!/usr/bin/env python3
-import json
+import sys
+import orjson
 import os
+import mmap
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from aiohttp import web
 import asyncio
+import time
+import logging
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from functools import cached_property
+
+# Allow running as a script (python mcp/servers/<name>.py) with repo-root imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from mcp.servers.rpc import rpc_handler, run_server
+
+logger = logging.getLogger(__name__)
+
+# Seconds between write-behind flushes of dirty collections
+FLUSH_INTERVAL = 0.1
+
+# Append-only collections, persisted as JSONL logs instead of rewritten JSON lists
+APPEND_LOGS = ("facts", "contacts", "handoffs")
 
 class StoreServer:
-    """Store MCP server with JSON persistence"""
+    """Store MCP server with JSON/JSONL persistence"""
     
     def __init__(self):
         self.data_dir = Path(__file__).parent.parent.parent / "data"
@@ -16,193 +35,360 @@ class StoreServer:
         
         self.prospects_file = self.data_dir / "prospects.json"
         self.companies_file = self.data_dir / "companies_store.json"
-        self.facts_file = self.data_dir / "facts.json"
-        self.contacts_file = self.data_dir / "contacts.json"
-        self.handoffs_file = self.data_dir / "handoffs.json"
+        self.facts_file = self.data_dir / "facts.jsonl"
+        self.contacts_file = self.data_dir / "contacts.jsonl"
+        self.handoffs_file = self.data_dir / "handoffs.jsonl"
+        self.files = {
+            "prospects": self.prospects_file,
+            "companies": self.companies_file,
+            "facts": self.facts_file,
+            "contacts": self.contacts_file,
+            "handoffs": self.handoffs_file,
+        }
         
-        self.lock = asyncio.Lock()
-        self._load_data()
+        # One lock per collection so writes to unrelated files don't queue behind each other
+        self.locks = {name: asyncio.Lock() for name in self.files}
+        # Collections changed since the last flush; rewritten once per interval
+        self._dirty = set()
+        # Records added to APPEND_LOGS collections since the last flush; appended, not rewritten
+        self._appends = defaultdict(list)
+        # Serializes flushes so snapshots reach disk in the order they were taken
+        self.write_lock = asyncio.Lock()
+        self._flusher = None
+        self._closing = False
     
-    def _load_data(self):
-        """Load data from files"""
-        self.prospects = self._load_json(self.prospects_file, [])
-        self.companies = self._load_json(self.companies_file, [])
-        self.facts = self._load_json(self.facts_file, [])
-        self.contacts = self._load_json(self.contacts_file, [])
-        self.handoffs = self._load_json(self.handoffs_file, [])
-        
-        # Load suppressions
-        supp_file = self.data_dir / "suppression.json"
-        self.suppressions = self._load_json(supp_file, [])
+    # Collections load on first access (cached_property), so startup parses no files
+    # and a run that never touches a collection never reads it. clear_all simply
+    # assigns over the cached values.
+    
+    @cached_property
+    def prospects(self):
+        # Prospects and companies are keyed by id (insertion-ordered); files hold lists
+        return self._by_id(self._load_json(self.prospects_file, []))
+    
+    @cached_property
+    def companies(self):
+        return self._by_id(self._load_json(self.companies_file, []))
+    
+    @cached_property
+    def facts(self):
+        return self._load_log("facts")
+    
+    @cached_property
+    def contacts(self):
+        return self._load_log("contacts")
+    
+    @cached_property
+    def handoffs(self):
+        return self._load_log("handoffs")
+    
+    @cached_property
+    def fact_ids(self):
+        return self._ids(self.facts)
+    
+    @cached_property
+    def contact_ids(self):
+        return self._ids(self.contacts)
+    
+    @cached_property
+    def contacts_by_domain(self):
+        """Contacts bucketed by email domain for list_contacts_by_domain"""
+        index = defaultdict(list)
+        for c in self.contacts:
+            domain = self._contact_domain(c)
+            if domain:
+                index[domain].append(c)
+        return index
+    
+    @cached_property
+    def seed_companies(self):
+        # Seed companies back get_company misses; parse the file once
+        return self._by_id(self._load_json(self.data_dir / "companies.json", []))
+    
+    @cached_property
+    def suppressions(self):
+        suppressions = self._load_json(self.data_dir / "suppression.json", [])
+        # Ensure suppressions is a list
+        return suppressions if isinstance(suppressions, list) else []
+    
+    @cached_property
+    def supp_index(self):
+        """Suppressions bucketed by (type, value) for check_suppression"""
+        index = defaultdict(list)
+        for supp in self.suppressions:
+            if isinstance(supp, dict):
+                # Parse the expiry once, at ingestion, into an epoch float
+                supp["_expires_ts"] = self._expires_ts(supp)
+                index[(supp.get("type"), supp.get("value"))].append(supp)
+        return index
+    
+    def _expires_ts(self, supp):
+        """Unix timestamp of a suppression's expires_at (None: never expires)"""
+        if not supp.get("expires_at"):
+            return None
+        try:
+            expires = datetime.fromisoformat(supp["expires_at"].replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            # Unparseable expiry: keep the suppression in force
+            return None
+        # Naive timestamps are UTC
+        if expires.tzinfo is None:
+            expires = expires.replace(tzinfo=timezone.utc)
+        return expires.timestamp()
+    
+    def _contact_domain(self, contact):
+        # Only well-formed contacts with an email are listable by domain;
+        # split and lowercase once here so lookups are a plain key match
+        if isinstance(contact, dict) and "@" in contact.get("email", ""):
+            return contact["email"].rsplit("@", 1)[1].lower()
+        return None
+    
+    def _ids(self, records):
+        """Ids already present in a list collection"""
+        return {r.get("id") for r in records if isinstance(r, dict) and r.get("id")}
+    
+    def _by_id(self, records):
+        """Index a list of records by their id"""
+        return {r["id"]: r for r in records if isinstance(r, dict) and "id" in r}
     
     def _load_json(self, path, default):
         """Load JSON file safely"""
         if path.exists():
             try:
-                with open(path) as f:
-                    content = json.load(f)
-                    # Return empty list if content is None or not a list/dict
-                    if content is None:
-                        return default
-                    return content
-            except (json.JSONDecodeError, IOError):
+                # Parse straight from the page cache instead of copying through a read buffer
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        content = orjson.loads(view)
+                # Return empty list if content is None or not a list/dict
+                if content is None:
+                    return default
+                return content
+            except (ValueError, IOError):
+                # Covers orjson.JSONDecodeError and mmap's refusal to map an empty file
                 return default
         return default
     
+    def _load_log(self, name):
+        """Load a JSONL log, migrating the pre-JSONL <name>.json list on first run"""
+        path = self.files[name]
+        if not path.exists():
+            legacy = self._load_json(path.with_suffix(".json"), [])
+            if legacy:
+                # Rewrite as JSONL on the first flush
+                self._dirty.add(name)
+            return legacy if isinstance(legacy, list) else []
+        
+        records = []
+        try:
+            raw = path.read_bytes()
+        except IOError:
+            return records
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                # A torn line from an interrupted append; skip it
+                continue
+        if raw and not raw.endswith(b"\n"):
+            # Rewrite so the next append doesn't land on the torn tail
+            self._dirty.add(name)
+        return records
+    
     def _save_json(self, path, data):
-        """Save JSON file"""
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        """Save JSON file atomically: write a sibling tmp file, then rename over the target"""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(orjson.dumps(data, default=str))
+        os.replace(tmp, path)
     
-    async def handle_rpc(self, request):
-        data = await request.json()
-        method = data.get("method")
-        params = data.get("params", {})
+    def _save_jsonl(self, path, records):
+        """Rewrite a JSONL log atomically (clear_all, legacy migration)"""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(b"".join(orjson.dumps(r, default=str) + b"\n" for r in records))
+        os.replace(tmp, path)
+    
+    def _append_jsonl(self, path, records):
+        """Append records to a JSONL log in a single write"""
+        with open(path, "ab") as f:
+            f.write(b"".join(orjson.dumps(r, default=str) + b"\n" for r in records))
+    
+    def _take_dirty(self):
+        """Snapshot pending writes as (name, writer, path, records) and reset the pending state
+        
+        Runs without awaiting, so no write can interleave with the copy.
+        """
+        writes = []
+        for name in self._dirty:
+            data = getattr(self, name)
+            records = list(data.values()) if isinstance(data, dict) else list(data)
+            writer = self._save_jsonl if name in APPEND_LOGS else self._save_json
+            writes.append((name, writer, self.files[name], records))
+        for name, records in self._appends.items():
+            # A full rewrite already includes the appended records
+            if name not in self._dirty:
+                writes.append((name, self._append_jsonl, self.files[name], records))
+        self._dirty.clear()
+        self._appends = defaultdict(list)
+        return writes
+    
+    async def _flush(self):
+        """Write pending changes once; file I/O runs off the event loop, outside the collection locks"""
+        async with self.write_lock:
+            for name, writer, path, records in self._take_dirty():
+                try:
+                    await asyncio.to_thread(writer, path, records)
+                except Exception as e:
+                    # Memory still holds every record; retry as a full rewrite next
+                    # flush (also repairs a partially written append)
+                    logger.error(f"Failed to write {path.name}: {e}")
+                    self._dirty.add(name)
+    
+    async def _flush_loop(self):
+        """Coalesce bursts of saves into one write per file per interval"""
+        while not self._closing:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            if self._dirty or self._appends:
+                try:
+                    await self._flush()
+                except Exception as e:
+                    # Keep flushing; failed collections stay dirty
+                    logger.error(f"Flush failed: {e}")
+    
+    async def start(self, app):
+        self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def shutdown(self, app):
+        """Stop the flush loop and write anything still pending"""
+        # Let the loop exit on its own rather than cancelling a write mid-thread
+        self._closing = True
+        if self._flusher:
+            await self._flusher
+        await self._flush()
+    
+    async def dispatch(self, method: str, params: dict) -> dict:
+        """Handle one RPC call and return its response payload"""
         
         if method == "health":
-            return web.json_response({"result": "ok"})
+            return {"result": "ok"}
         
-        async with self.lock:
-            if method == "store.save_prospect":
+        if method == "store.clear_all":
+            async with AsyncExitStack() as stack:
+                # Take every collection lock, always in the same order
+                for name in self.files:
+                    await stack.enter_async_context(self.locks[name])
+                self.prospects = {}
+                self.companies = {}
+                self.facts = []
+                self.contacts = []
+                self.handoffs = []
+                self.fact_ids = set()
+                self.contact_ids = set()
+                self.contacts_by_domain = defaultdict(list)
+                self._dirty.update(self.files)
+                self._appends = defaultdict(list)
+            
+            # Write the empty files now rather than on the next tick
+            await self._flush()
+            return {"result": "cleared"}
+        
+        # Reads take no lock: each is a single dict/list access, atomic between awaits
+        if method == "store.get_prospect":
+            return {"result": self.prospects.get(params["id"])}
+        
+        elif method == "store.list_prospects":
+            return {"result": list(self.prospects.values())}
+        
+        elif method == "store.get_company":
+            company_id = params["id"]
+            company = self.companies.get(company_id) or self.seed_companies.get(company_id)
+            return {"result": company}
+        
+        elif method == "store.list_contacts_by_domain":
+            # Copy the bucket; .get avoids creating empty buckets for unknown domains
+            return {"result": list(self.contacts_by_domain.get(params["domain"].lower(), []))}
+        
+        elif method == "store.check_suppression":
+            key = (params["type"], params["value"])
+            bucket = self.supp_index.get(key)
+            if not bucket:
+                return {"result": False}
+            
+            # Prune expired entries on access; they can never match again
+            now_ts = time.time()
+            bucket[:] = [supp for supp in bucket
+                         if supp["_expires_ts"] is None or supp["_expires_ts"] >= now_ts]
+            if not bucket:
+                del self.supp_index[key]
+            return {"result": bool(bucket)}
+        
+        # Writes lock only the collection they touch
+        elif method == "store.save_prospect":
+            async with self.locks["prospects"]:
                 prospect = params["prospect"]
                 # Update or add
-                found = False
-                for i, p in enumerate(self.prospects):
-                    if p["id"] == prospect["id"]:
-                        self.prospects[i] = prospect
-                        found = True
-                        break
-                if not found:
-                    self.prospects.append(prospect)
+                self.prospects[prospect["id"]] = prospect
                 
-                self._save_json(self.prospects_file, self.prospects)
-                return web.json_response({"result": "saved"})
-            
-            elif method == "store.get_prospect":
-                prospect_id = params["id"]
-                for p in self.prospects:
-                    if p["id"] == prospect_id:
-                        return web.json_response({"result": p})
-                return web.json_response({"result": None})
-            
-            elif method == "store.list_prospects":
-                return web.json_response({"result": self.prospects})
-            
-            elif method == "store.save_company":
+                self._dirty.add("prospects")
+            return {"result": "saved"}
+        
+        elif method == "store.save_company":
+            async with self.locks["companies"]:
                 company = params["company"]
-                found = False
-                for i, c in enumerate(self.companies):
-                    if c["id"] == company["id"]:
-                        self.companies[i] = company
-                        found = True
-                        break
-                if not found:
-                    self.companies.append(company)
-                
-                self._save_json(self.companies_file, self.companies)
-                return web.json_response({"result": "saved"})
-            
-            elif method == "store.get_company":
-                company_id = params["id"]
-                for c in self.companies:
-                    if c["id"] == company_id:
-                        return web.json_response({"result": c})
+                self.companies[company["id"]] = company
                 
-                # Check seed file
-                seed_file = self.data_dir / "companies.json"
-                if seed_file.exists():
-                    with open(seed_file) as f:
-                        seeds = json.load(f)
-                    for c in seeds:
-                        if c["id"] == company_id:
-                            return web.json_response({"result": c})
-                
-                return web.json_response({"result": None})
-            
-            elif method == "store.save_fact":
+                self._dirty.add("companies")
+            return {"result": "saved"}
+        
+        elif method == "store.save_fact":
+            async with self.locks["facts"]:
                 fact = params["fact"]
                 # Check if fact already exists by ID
-                existing_ids = {f.get("id") for f in self.facts if f.get("id")}
-                if fact.get("id") not in existing_ids:
+                if fact.get("id") not in self.fact_ids:
                     self.facts.append(fact)
-                    self._save_json(self.facts_file, self.facts)
-                return web.json_response({"result": "saved"})
-            
-            elif method == "store.save_contact":
+                    self.fact_ids.add(fact.get("id"))
+                    self._appends["facts"].append(fact)
+            return {"result": "saved"}
+        
+        elif method == "store.save_facts":
+            async with self.locks["facts"]:
+                for fact in params["facts"]:
+                    if fact.get("id") not in self.fact_ids:
+                        self.facts.append(fact)
+                        self.fact_ids.add(fact.get("id"))
+                        self._appends["facts"].append(fact)
+            return {"result": "saved"}
+        
+        elif method == "store.save_contact":
+            async with self.locks["contacts"]:
                 contact = params["contact"]
                 # Check if contact already exists by ID
-                existing_ids = {c.get("id") for c in self.contacts if c.get("id")}
-                if contact.get("id") not in existing_ids:
+                if contact.get("id") not in self.contact_ids:
+                    # Build the lazy domain index before appending, or it would
+                    # already contain the contact and index it twice
+                    by_domain = self.contacts_by_domain
                     self.contacts.append(contact)
-                    self._save_json(self.contacts_file, self.contacts)
-                return web.json_response({"result": "saved"})
-            
-            elif method == "store.list_contacts_by_domain":
-                domain = params["domain"]
-                # Ensure contacts is a list
-                if not isinstance(self.contacts, list):
-                    self.contacts = []
-                
-                results = []
-                for c in self.contacts:
-                    # Ensure contact has email field
-                    if isinstance(c, dict) and "email" in c:
-                        email = c["email"]
-                        # Check if email ends with the domain
-                        if email.endswith(f"@{domain}"):
-                            results.append(c)
-                
-                return web.json_response({"result": results})
-            
-            elif method == "store.check_suppression":
-                supp_type = params["type"]
-                value = params["value"]
-                
-                # Ensure suppressions is a list
-                if not isinstance(self.suppressions, list):
-                    self.suppressions = []
-                
-                for supp in self.suppressions:
-                    if isinstance(supp, dict):
-                        if supp.get("type") == supp_type and supp.get("value") == value:
-                            # Check expiry
-                            if supp.get("expires_at"):
-                                try:
-                                    expires = datetime.fromisoformat(supp["expires_at"].replace("Z", "+00:00"))
-                                    if expires < datetime.utcnow():
-                                        continue
-                                except:
-                                    pass
-                            return web.json_response({"result": True})
-                
-                return web.json_response({"result": False})
-            
-            elif method == "store.save_handoff":
+                    self.contact_ids.add(contact.get("id"))
+                    domain = self._contact_domain(contact)
+                    if domain:
+                        by_domain[domain].append(contact)
+                    self._appends["contacts"].append(contact)
+            return {"result": "saved"}
+        
+        elif method == "store.save_handoff":
+            async with self.locks["handoffs"]:
                 packet = params["packet"]
                 self.handoffs.append(packet)
-                self._save_json(self.handoffs_file, self.handoffs)
-                return web.json_response({"result": "saved"})
-            
-            elif method == "store.clear_all":
-                self.prospects = []
-                self.companies = []
-                self.facts = []
-                self.contacts = []
-                self.handoffs = []
-                
-                self._save_json(self.prospects_file, [])
-                self._save_json(self.companies_file, [])
-                self._save_json(self.facts_file, [])
-                self._save_json(self.contacts_file, [])
-                self._save_json(self.handoffs_file, [])
-                
-                return web.json_response({"result": "cleared"})
+                self._appends["handoffs"].append(packet)
+            return {"result": "saved"}
         
-        return web.json_response({"error": f"Unknown method: {method}"}, status=400)
+        return {"error": f"Unknown method: {method}"}
 
 app = web.Application()
 server = StoreServer()
-app.router.add_post("/rpc", server.handle_rpc)
+app.router.add_post("/rpc", rpc_handler(server.dispatch))
+app.on_startup.append(server.start)
+app.on_shutdown.append(server.shutdown)
 
 if __name__ == "__main__":
-    web.run_app(app, port=9004)
\ No newline at end of file
+    run_server(app, 9004)
\ No newline at end of file
@@ -11,4 +11,4 @@ export PYTHONPATH="${PYTHONPATH}:$(pwd)"
 
 # Run FastAPI server
 echo "Starting FastAPI server on port 8000..."
-uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
\ No newline at end of file
+uvicorn app.main:app --reload --host 0.0.0.0 --port 8000 --loop auto
\ No newline at end of file
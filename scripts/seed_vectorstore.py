@@ -4,8 +4,14 @@
 
 import sys
 import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import faiss
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -13,11 +19,28 @@ from vector.store import VectorStore
 from vector.embeddings import get_embedding_model
 from app.config import DATA_DIR
 
-def seed_vectorstore():
-    """Build and persist the initial vector index"""
+def _encode_shard(texts):
+    """Pool worker: encode one shard with this process's model (loaded once per worker)"""
+    return get_embedding_model().encode(texts)
+
+def encode_parallel(texts, workers: int):
+    """Encode texts across worker processes in contiguous shards, preserving order"""
+    size = -(-len(texts) // workers)
+    shards = [texts[i:i + size] for i in range(0, len(texts), size)]
+    # spawn: forking after torch has started its thread pools can deadlock
+    with ProcessPoolExecutor(max_workers=len(shards),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        return np.concatenate(list(pool.map(_encode_shard, shards)))
+
+def seed_vectorstore(verify: bool = False, workers: int = 1, quantize: bool = False):
+    """Build and persist the initial vector index; optionally run a sample retrieval"""
     
     print("Initializing vector store...")
-    store = VectorStore()
+    # sq8: FAISS int8 scalar quantizer, 4x smaller than float32 vectors
+    store = VectorStore(index_type="sq8" if quantize else None)
+    if quantize and store.is_initialized() and not isinstance(store.index, faiss.IndexScalarQuantizer):
+        print(f"Warning: keeping the existing unquantized index at {store.index_path}; "
+              "delete it to rebuild quantized")
     model = get_embedding_model()
     
     # Load companies
@@ -31,41 +54,48 @@ def seed_vectorstore():
     
     print(f"Loading {len(companies)} companies...")
     
+    # Structure of arrays: one flat list per field, zipped into metadata after encoding
+    company_ids = []
+    types = []
     texts = []
-    metadata = []
     
     for company in companies:
+        company_id = company["id"]
+        name = company["name"]
+        # Formatted once per company, not per pain/note
+        pain_prefix = f"{name} challenge: "
+        note_prefix = f"{name}: "
+        
         # Company description
-        desc = f"{company['name']} is a {company['industry']} company with {company['size']} employees"
+        desc = f"{name} is a {company['industry']} company with {company['size']} employees"
+        company_ids.append(company_id)
+        types.append("description")
         texts.append(desc)
-        metadata.append({
-            "company_id": company["id"],
-            "type": "description",
-            "text": desc
-        })
         
         # Pain points
         for pain in company.get("pains", []):
-            pain_text = f"{company['name']} challenge: {pain}"
-            texts.append(pain_text)
-            metadata.append({
-                "company_id": company["id"],
-                "type": "pain",
-                "text": pain_text
-            })
+            company_ids.append(company_id)
+            types.append("pain")
+            texts.append(pain_prefix + pain)
         
         # Notes
         for note in company.get("notes", []):
-            note_text = f"{company['name']}: {note}"
-            texts.append(note_text)
-            metadata.append({
-                "company_id": company["id"],
-                "type": "note",
-                "text": note_text
-            })
+            company_ids.append(company_id)
+            types.append("note")
+            texts.append(note_prefix + note)
     
+    # EmbeddingModel.encode already batches (EMBEDDING_BATCH_SIZE) and normalizes;
+    # extra workers only pay off once encoding outweighs loading the model per process
     print(f"Encoding {len(texts)} documents...")
-    embeddings = model.encode(texts)
+    if workers > 1 and len(texts) > workers:
+        embeddings = encode_parallel(texts, workers)
+    else:
+        embeddings = model.encode(texts)
+    
+    metadata = [
+        {"company_id": company_id, "type": doc_type, "text": text}
+        for company_id, doc_type, text in zip(company_ids, types, texts)
+    ]
     
     print("Adding to index...")
     store.add(embeddings, metadata)
@@ -73,10 +103,13 @@ def seed_vectorstore():
     print(f"Vector store initialized with {len(texts)} documents")
     print(f"Index saved to: {store.index_path}")
     
-    # Test retrieval
+    if not verify:
+        return
+    
+    # Test retrieval against the index and model already in memory
     print("\nTesting retrieval...")
     from vector.retriever import Retriever
-    retriever = Retriever()
+    retriever = Retriever(store=store, model=model)
     
     for company in companies[:1]:  # Test with first company
         results = retriever.retrieve(company["id"], k=3)
@@ -85,4 +118,12 @@ def seed_vectorstore():
             print(f"  - {r['text'][:80]}... (score: {r.get('score', 0):.3f})")
 
 if __name__ == "__main__":
-    seed_vectorstore()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the vector store with initial data")
+    parser.add_argument("--verify", action="store_true",
+                        help="run a sample retrieval after seeding")
+    parser.add_argument("--quantize", action="store_true",
+                        help="build a new index with int8 scalar quantization (VECTOR_INDEX_TYPE=sq8)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="encode in this many processes (CPU-only seeds of large company sets)")
+    args = parser.parse_args()
+    seed_vectorstore(verify=args.verify, workers=args.workers, quantize=args.quantize)
\ No newline at end of file
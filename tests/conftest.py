@@ -1,8 +1,133 @@
+import asyncio
+import inspect
 import os
 import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
 
 # Ensure the repository root is on sys.path so imports like `import app` and `import agents` work
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
+from app.schema import Company, Prospect  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests (asyncio_mode = "auto") on uvloop where it is available, as the servers do"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture
+def mock_store():
+    """Store client double: every method is an AsyncMock, saves return None"""
+    store = AsyncMock()
+    store.save_prospect.return_value = None
+    store.save_contact.return_value = None
+    return store
+
+
+@pytest.fixture
+def mock_mcp(mock_store):
+    """MCP registry double wired to mock_store.
+
+    Function-scoped on purpose: tests set side_effects on the store, which
+    reset_mock() would not clear between tests.
+    """
+    mcp = Mock()
+    mcp.get_store_client.return_value = mock_store
+    return mcp
+
+
+class AsyncStub:
+    """Lightweight async client double (no Mock machinery).
+
+    Any method name is awaitable and returns ``returns[name]`` (None if unset);
+    a callable value is called with the arguments instead, and awaited if it
+    returns a coroutine. Calls are recorded in ``calls`` as (name, args, kwargs).
+    """
+    
+    def __init__(self, **returns):
+        self.returns = returns
+        self.calls = []
+    
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        
+        async def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return await self.reply(name, *args, **kwargs)
+        return method
+    
+    async def reply(self, name, *args, **kwargs):
+        """What method ``name`` returns for these arguments, without recording a call"""
+        result = self.returns.get(name)
+        if callable(result):
+            result = result(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+    
+    def called(self, name):
+        """Whether method ``name`` was awaited at least once"""
+        return any(call[0] == name for call in self.calls)
+
+
+@pytest.fixture
+def mcp_bundle():
+    """MCP registry double whose store/search/email/calendar clients are AsyncStubs.
+
+    Defaults let a prospect run the whole pipeline with nothing suppressed;
+    tests override entries in e.g. ``mcp_bundle.store.returns``. Batched
+    ``check_suppressions`` answers each pair like ``check_suppression``, so
+    overriding the latter covers both.
+    """
+    store = AsyncStub(check_suppression=False, list_contacts_by_domain=[])
+    store.returns["check_suppressions"] = lambda checks: asyncio.gather(*(
+        store.reply("check_suppression", type, value) for type, value in checks
+    ))
+    search = AsyncStub(query=[])
+    email = AsyncStub(send={})
+    calendar = AsyncStub(suggest_slots=[], generate_ics="")
+    
+    mcp = Mock()
+    mcp.get_store_client.return_value = store
+    mcp.get_search_client.return_value = search
+    mcp.get_email_client.return_value = email
+    mcp.get_calendar_client.return_value = calendar
+    return SimpleNamespace(mcp=mcp, store=store, search=search,
+                           email=email, calendar=calendar)
+
+
+@pytest.fixture
+def make_company():
+    """Factory for a small SaaS Company; keyword args override fields"""
+    def make(**overrides):
+        fields = {
+            "id": "test",
+            "name": "Test Co",
+            "domain": "test.com",
+            "industry": "SaaS",
+            "size": 100,
+            "pains": [],
+        }
+        fields.update(overrides)
+        return Company(**fields)
+    return make
+
+
+@pytest.fixture
+def make_prospect(make_company):
+    """Factory for a Prospect (default company from make_company); keyword args set Prospect fields"""
+    def make(company=None, **fields):
+        fields.setdefault("id", "test-prospect")
+        return Prospect(company=company or make_company(), **fields)
+    return make
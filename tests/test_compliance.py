@@ -1,32 +1,13 @@
 # file: tests/test_compliance.py
-import pytest
-from unittest.mock import Mock, AsyncMock
-from pathlib import Path
 from agents.compliance import Compliance
-from app.schema import Prospect, Company, Contact
+from app.schema import Contact
 
-@pytest.mark.asyncio
-async def test_footer_insertion():
+async def test_footer_insertion(mock_mcp, mock_store, make_prospect):
     """Test that compliance agent inserts footer"""
     
-    mock_mcp = Mock()
-    mock_store = AsyncMock()
-    mock_mcp.get_store_client.return_value = mock_store
-    mock_store.check_suppression.return_value = False
-    mock_store.save_prospect.return_value = None
+    mock_store.check_suppressions.side_effect = lambda checks: [False] * len(checks)
     
-    company = Company(
-        id="test",
-        name="Test Co",
-        domain="test.com",
-        industry="SaaS",
-        size=100,
-        pains=[]
-    )
-    
-    prospect = Prospect(
-        id="test-prospect",
-        company=company,
+    prospect = make_prospect(
         status="drafted",
         email_draft={
             "subject": "Test Subject",
@@ -51,32 +32,15 @@ async def test_footer_insertion():
     assert "unsubscribe" in result.email_draft["body"].lower()
     assert result.status == "compliant"
 
-@pytest.mark.asyncio
-async def test_suppression_enforcement():
+async def test_suppression_enforcement(mock_mcp, mock_store, make_prospect):
     """Test that suppressed emails are blocked"""
     
-    mock_mcp = Mock()
-    mock_store = AsyncMock()
-    mock_mcp.get_store_client.return_value = mock_store
-    
     # Suppress the email
-    mock_store.check_suppression.side_effect = lambda type, value: (
-        True if type == "email" and value == "blocked@test.com" else False
-    )
-    mock_store.save_prospect.return_value = None
+    mock_store.check_suppressions.side_effect = lambda checks: [
+        type == "email" and value == "blocked@test.com" for type, value in checks
+    ]
     
-    company = Company(
-        id="test",
-        name="Test Co",
-        domain="test.com",
-        industry="SaaS",
-        size=100,
-        pains=[]
-    )
-    
-    prospect = Prospect(
-        id="test-prospect",
-        company=company,
+    prospect = make_prospect(
         status="drafted",
         email_draft={
             "subject": "Test",
@@ -100,28 +64,12 @@ async def test_suppression_enforcement():
     assert result.status == "blocked"
     assert "suppressed" in result.dropped_reason.lower()
 
-@pytest.mark.asyncio
-async def test_unverifiable_claims_blocking():
+async def test_unverifiable_claims_blocking(mock_mcp, mock_store, make_prospect):
     """Test that unverifiable claims are caught"""
     
-    mock_mcp = Mock()
-    mock_store = AsyncMock()
-    mock_mcp.get_store_client.return_value = mock_store
-    mock_store.check_suppression.return_value = False
-    mock_store.save_prospect.return_value = None
-    
-    company = Company(
-        id="test",
-        name="Test Co",
-        domain="test.com",
-        industry="SaaS",
-        size=100,
-        pains=[]
-    )
+    mock_store.check_suppressions.side_effect = lambda checks: [False] * len(checks)
     
-    prospect = Prospect(
-        id="test-prospect",
-        company=company,
+    prospect = make_prospect(
         status="drafted",
         email_draft={
             "subject": "Guaranteed Results",
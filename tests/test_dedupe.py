@@ -1,18 +1,10 @@
 # file: tests/test_dedupe.py
-import pytest
-from unittest.mock import Mock, AsyncMock
 from agents.contactor import Contactor
-from app.schema import Prospect, Company, Contact
+from app.schema import Contact
 
-@pytest.mark.asyncio
-async def test_contact_deduplication():
+async def test_contact_deduplication(mock_mcp, mock_store, make_company, make_prospect):
     """Test that Contactor dedupes emails properly"""
     
-    # Mock MCP registry
-    mock_mcp = Mock()
-    mock_store = AsyncMock()
-    mock_mcp.get_store_client.return_value = mock_store
-    
     # Setup existing contacts
     existing_contacts = [
         Contact(
@@ -26,24 +18,10 @@ async def test_contact_deduplication():
     
     mock_store.list_contacts_by_domain.return_value = existing_contacts
     mock_store.check_suppression.return_value = False
-    mock_store.save_contact.return_value = None
-    mock_store.save_prospect.return_value = None
     
     # Create test prospect
-    company = Company(
-        id="acme",
-        name="Acme Corp",
-        domain="acme.com",
-        industry="SaaS",
-        size=100,
-        pains=[]
-    )
-    
-    prospect = Prospect(
-        id="test-prospect",
-        company=company,
-        status="enriched"
-    )
+    company = make_company(id="acme", name="Acme Corp", domain="acme.com")
+    prospect = make_prospect(company=company, status="enriched")
     
     # Run contactor
     contactor = Contactor(mock_mcp)
@@ -59,14 +37,9 @@ async def test_contact_deduplication():
     # Verify store was called correctly
     mock_store.list_contacts_by_domain.assert_called_with("acme.com")
 
-@pytest.mark.asyncio
-async def test_domain_deduplication():
+async def test_domain_deduplication(mock_mcp, mock_store, make_company, make_prospect):
     """Test that same-domain contacts are properly deduplicated"""
     
-    mock_mcp = Mock()
-    mock_store = AsyncMock()
-    mock_mcp.get_store_client.return_value = mock_store
-    
     # Multiple existing contacts from same domain
     existing_contacts = [
         Contact(id="1", name="Contact 1", email="vp@acme.com", 
@@ -77,23 +50,9 @@ async def test_domain_deduplication():
     
     mock_store.list_contacts_by_domain.return_value = existing_contacts
     mock_store.check_suppression.return_value = False
-    mock_store.save_contact.return_value = None
-    mock_store.save_prospect.return_value = None
-    
-    company = Company(
-        id="acme",
-        name="Acme Corp",
-        domain="acme.com",
-        industry="SaaS",
-        size=500,
-        pains=[]
-    )
     
-    prospect = Prospect(
-        id="test-prospect",
-        company=company,
-        status="enriched"
-    )
+    company = make_company(id="acme", name="Acme Corp", domain="acme.com", size=500)
+    prospect = make_prospect(company=company, status="enriched")
     
     contactor = Contactor(mock_mcp)
     result = await contactor.run(prospect)
@@ -0,0 +1,35 @@
+# file: tests/test_embeddings.py
+import numpy as np
+from vector.embeddings import EmbeddingCache
+
+def test_embedding_cache_roundtrip(tmp_path):
+    """Test that cached embeddings come back by text, per model"""
+    
+    cache = EmbeddingCache(tmp_path / "emb.db", "model-a")
+    vectors = np.random.randn(2, 8).astype(np.float32)
+    cache.put_many(["alpha", "beta"], vectors)
+    
+    found = cache.get_many(["beta", "gamma", "alpha"])
+    
+    assert set(found) == {0, 2}
+    assert np.allclose(found[0], vectors[1])
+    assert np.allclose(found[2], vectors[0])
+    
+    # A different model must not see another model's vectors
+    other = EmbeddingCache(tmp_path / "emb.db", "model-b")
+    assert other.get_many(["alpha"]) == {}
+
+def test_embedding_cache_memory_lru(tmp_path):
+    """Test that the in-memory LRU is bounded and falls back to SQLite"""
+    
+    cache = EmbeddingCache(tmp_path / "emb.db", "model-a")
+    cache.MEMORY_SIZE = 2
+    vectors = np.random.randn(3, 8).astype(np.float32)
+    cache.put_many(["a", "b", "c"], vectors)
+    
+    assert len(cache.memory) == 2
+    
+    # "a" was evicted from memory but is still on disk
+    found = cache.get_many(["a"])
+    assert np.allclose(found[0], vectors[0])
+    assert cache._key("a") in cache.memory
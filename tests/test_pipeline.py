@@ -1,257 +1,184 @@
 # file: tests/test_pipeline.py
 import pytest
-import json
-from unittest.mock import Mock, AsyncMock, patch, mock_open
 from app.orchestrator import Orchestrator
-from app.schema import Company, Prospect
+from agents.writer import Writer
+from app.schema import Company
 from pathlib import Path
-import asyncio
+from collections import Counter
 
-@pytest.mark.asyncio
-async def test_pipeline_happy_path():
-    """Test full pipeline execution without streaming details"""
-    
-    # Create a test company in mock data
-    test_company = {
-        "id": "test",
-        "name": "Test Co",
-        "domain": "test.com",
-        "industry": "SaaS",
-        "size": 100,
-        "pains": ["Low NPS scores"],
-        "notes": ["Growing company"]
-    }
+
+def _fake_stream(*replies):
+    """Stand-in for Writer._stream_generate yielding one canned token list per call"""
+    replies = iter(replies)
     
-    # Mock file operations for companies.json
-    with patch('builtins.open', mock_open(read_data=json.dumps([test_company]))):
-        # Mock MCP registry at module level
-        with patch('app.orchestrator.MCPRegistry') as MockMCPRegistry:
-            mock_mcp = Mock()
-            MockMCPRegistry.return_value = mock_mcp
-            
-            # Mock store client
-            mock_store = AsyncMock()
-            mock_store.save_prospect = AsyncMock(return_value=None)
-            mock_store.save_company = AsyncMock(return_value=None)
-            mock_store.save_fact = AsyncMock(return_value=None)
-            mock_store.save_contact = AsyncMock(return_value=None)
-            mock_store.save_handoff = AsyncMock(return_value=None)
-            mock_store.check_suppression = AsyncMock(return_value=False)
-            mock_store.list_contacts_by_domain = AsyncMock(return_value=[])
-            
-            # Mock search client
-            mock_search = AsyncMock()
-            mock_search.query = AsyncMock(return_value=[
-                {
-                    "text": "Test Co focuses on customer experience",
-                    "source": "Industry Report",
-                    "confidence": 0.85
-                }
-            ])
-            
-            # Mock email client
-            mock_email = AsyncMock()
-            mock_email.send = AsyncMock(return_value={"thread_id": "test-thread-123", "message_id": "msg-456", "prospect_id": "test"})
-            mock_email.get_thread = AsyncMock(return_value={
-                "id": "test-thread-123",
-                "prospect_id": "test",
-                "messages": [{
-                    "id": "msg-456",
-                    "thread_id": "test-thread-123",
-                    "direction": "outbound",
-                    "subject": "Test Subject",
-                    "body": "Test Body",
-                    "sent_at": "2024-01-01T00:00:00"
-                }]
-            })
-            
-            # Mock calendar client
-            mock_calendar = AsyncMock()
-            mock_calendar.suggest_slots = AsyncMock(return_value=[
-                {"start_iso": "2024-01-02T14:00:00", "end_iso": "2024-01-02T14:30:00"}
-            ])
-            mock_calendar.generate_ics = AsyncMock(return_value="BEGIN:VCALENDAR...")
-            
-            # Configure mock MCP
-            mock_mcp.get_store_client.return_value = mock_store
-            mock_mcp.get_search_client.return_value = mock_search
-            mock_mcp.get_email_client.return_value = mock_email
-            mock_mcp.get_calendar_client.return_value = mock_calendar
-            
-            # Mock Path for footer file
-            with patch.object(Path, 'exists', return_value=True):
-                with patch.object(Path, 'read_text', return_value="\n---\nTest Footer"):
-                    # Mock vector retriever
-                    with patch('agents.writer.Retriever') as MockRetriever:
-                        mock_retriever = Mock()
-                        mock_retriever.retrieve.return_value = [
-                            {"text": "Relevant fact 1", "score": 0.9}
-                        ]
-                        MockRetriever.return_value = mock_retriever
-                        
-                        # Mock requests for Ollama (fallback in Writer)
-                        with patch('agents.writer.aiohttp.ClientSession') as MockSession:
-                            # Create a mock that fails, triggering the fallback in Writer
-                            mock_session = AsyncMock()
-                            mock_session.post.side_effect = Exception("Connection failed")
-                            MockSession.return_value.__aenter__.return_value = mock_session
-                            
-                            # Create orchestrator
-                            orchestrator = Orchestrator()
-                            
-                            # Collect all events
-                            events = []
-                            async for event in orchestrator.run_pipeline(["test"]):
-                                events.append(event)
-                            
-                            # Verify key events occurred
-                            event_types = [e.get("type") for e in events]
-                            
-                            # Should have agent events
-                            assert "agent_start" in event_types
-                            assert "agent_end" in event_types
-                            
-                            # Should have MCP interactions
-                            assert "mcp_call" in event_types
-                            assert "mcp_response" in event_types
-                            
-                            # Check for either successful completion or policy block
-                            # (depends on whether email draft was generated via fallback)
-                            assert "llm_done" in event_types or "policy_block" in event_types
-                            
-                            # Verify core MCP operations were attempted
-                            assert mock_store.save_prospect.called
-                            assert mock_search.query.called
+    async def stream(self, session, prompt):
+        for token in next(replies):
+            yield token
+    return stream
+
 
-@pytest.mark.asyncio
-async def test_pipeline_compliance_block():
-    """Test that compliance violations block the pipeline"""
+class _StubRetriever:
+    """Vector retriever returning whatever the current test set on `result`"""
+    result = []
     
-    test_company = {
-        "id": "blocked-test",
-        "name": "Blocked Co",
-        "domain": "blocked.com",
-        "industry": "SaaS",
-        "size": 100,
-        "pains": ["Test pain"],
-        "notes": []
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def retrieve(self, *args, **kwargs):
+        return self.result
+
+
+@pytest.fixture
+def run_pipeline(mcp_bundle, monkeypatch):
+    """Run the orchestrator over the given seed companies with MCP, footer and retriever patched"""
+    async def run(companies, retrieved=()):
+        # Seed companies, MCP registry, compliance footer and vector retriever
+        seeds = [Company(**c) for c in companies]
+        monkeypatch.setattr('agents.hunter.load_companies', lambda: seeds)
+        monkeypatch.setattr('app.orchestrator.MCPRegistry', lambda: mcp_bundle.mcp)
+        monkeypatch.setattr(Path, 'exists', lambda self, **kwargs: True)
+        monkeypatch.setattr(Path, 'read_text', lambda self, *args, **kwargs: "\n---\nTest Footer")
+        monkeypatch.setattr('agents.writer.Retriever', _StubRetriever)
+        monkeypatch.setattr(_StubRetriever, 'result', list(retrieved))
+        
+        orchestrator = Orchestrator()
+        try:
+            return [event async for event in orchestrator.run_pipeline([c["id"] for c in companies])]
+        finally:
+            await orchestrator.writer.close()
+    return run
+
+
+HAPPY_COMPANY = {
+    "id": "test",
+    "name": "Test Co",
+    "domain": "test.com",
+    "industry": "SaaS",
+    "size": 100,
+    "pains": ["Low NPS scores"],
+    "notes": ["Growing company"]
+}
+
+BLOCKED_COMPANY = {
+    "id": "blocked-test",
+    "name": "Blocked Co",
+    "domain": "blocked.com",
+    "industry": "SaaS",
+    "size": 100,
+    "pains": ["Test pain"],
+    "notes": []
+}
+
+LOW_SCORE_COMPANY = {
+    "id": "low-score",
+    "name": "Small Co",
+    "domain": "small.com",
+    "industry": "Unknown",  # Low value industry
+    "size": 10,  # Too small
+    "pains": [],  # No pains
+    "notes": []
+}
+
+
+def _stub_downstream(bundle):
+    """Search, email and calendar replies shared by every scenario"""
+    bundle.search.returns["query"] = [
+        {
+            "text": "Test Co focuses on customer experience",
+            "source": "Industry Report",
+            "confidence": 0.85
+        }
+    ]
+    bundle.email.returns["send"] = {"thread_id": "test-thread-123", "message_id": "msg-456", "prospect_id": "test"}
+    bundle.email.returns["get_thread"] = {
+        "id": "test-thread-123",
+        "prospect_id": "test",
+        "messages": [{
+            "id": "msg-456",
+            "thread_id": "test-thread-123",
+            "direction": "outbound",
+            "subject": "Test Subject",
+            "body": "Test Body",
+            "sent_at": "2024-01-01T00:00:00"
+        }]
     }
+    bundle.calendar.returns["suggest_slots"] = [
+        {"start_iso": "2024-01-02T14:00:00", "end_iso": "2024-01-02T14:30:00"}
+    ]
+    bundle.calendar.returns["generate_ics"] = "BEGIN:VCALENDAR..."
+
+
+async def _suppress_blocked(type, value):
+    """check_suppression that suppresses blocked.com addresses (but not the domain,
+    so the prospect gets past Contactor and Compliance does the blocking)"""
+    return type == "email" and value.endswith("@blocked.com")
+
+
+def _event_text(events):
+    """Lowercased messages and payload reasons/statuses of all events"""
+    parts = []
+    for e in events:
+        payload = e.get("payload", {})
+        parts += [str(e.get("message", "")), str(payload.get("reason", "")), str(payload.get("status", ""))]
+    return " ".join(parts).lower()
+
+
+def _check_completed(events, bundle):
+    """Full pipeline execution without streaming details"""
+    # Verify key events occurred (one pass over the events)
+    event_types = Counter(e.get("type") for e in events)
+    
+    # Should have agent events
+    assert event_types["agent_start"] > 0
+    assert event_types["agent_end"] > 0
+    
+    # Should have MCP interactions
+    assert event_types["mcp_call"] > 0
+    assert event_types["mcp_response"] > 0
+    
+    # Tokens were streamed from the fake Ollama stream
+    assert event_types["llm_token"] > 0
+    
+    # Check for either successful completion or policy block
+    assert event_types["llm_done"] or event_types["policy_block"]
     
-    with patch('builtins.open', mock_open(read_data=json.dumps([test_company]))):
-        with patch('app.orchestrator.MCPRegistry') as MockMCPRegistry:
-            mock_mcp = Mock()
-            MockMCPRegistry.return_value = mock_mcp
-            
-            # Mock store with suppressed domain
-            mock_store = AsyncMock()
-            mock_store.save_prospect = AsyncMock(return_value=None)
-            mock_store.save_fact = AsyncMock(return_value=None)
-            mock_store.save_contact = AsyncMock(return_value=None)
-            
-            # This will make the domain suppressed
-            async def check_suppression(type, value):
-                if type == "domain" and value == "blocked.com":
-                    return True
-                if type == "email" and "blocked.com" in value:
-                    return True
-                return False
-            
-            mock_store.check_suppression = AsyncMock(side_effect=check_suppression)
-            mock_store.list_contacts_by_domain = AsyncMock(return_value=[])
-            
-            # Mock search
-            mock_search = AsyncMock()
-            mock_search.query = AsyncMock(return_value=[])
-            
-            # Mock email and calendar
-            mock_email = AsyncMock()
-            mock_calendar = AsyncMock()
-            
-            mock_mcp.get_store_client.return_value = mock_store
-            mock_mcp.get_search_client.return_value = mock_search
-            mock_mcp.get_email_client.return_value = mock_email
-            mock_mcp.get_calendar_client.return_value = mock_calendar
-            
-            with patch.object(Path, 'exists', return_value=True):
-                with patch.object(Path, 'read_text', return_value="\n---\nTest Footer"):
-                    with patch('agents.writer.Retriever') as MockRetriever:
-                        mock_retriever = Mock()
-                        mock_retriever.retrieve.return_value = []
-                        MockRetriever.return_value = mock_retriever
-                        
-                        orchestrator = Orchestrator()
-                        
-                        events = []
-                        async for event in orchestrator.run_pipeline(["blocked-test"]):
-                            events.append(event)
-                        
-                        # Should have dropped or blocked due to suppression
-                        messages = [str(e.get("message", "")).lower() for e in events]
-                        reasons = [str(e.get("payload", {}).get("reason", "")).lower() for e in events]
-                        all_text = " ".join(messages + reasons)
-                        
-                        assert "suppressed" in all_text or "dropped" in all_text or "blocked" in all_text, \
-                            f"Should have suppression/dropped/blocked message"
+    # Verify core MCP operations were attempted
+    assert bundle.store.called("save_prospect")
+    assert bundle.search.called("query")
 
-@pytest.mark.asyncio
-async def test_pipeline_scorer_drop():
-    """Test that low scores drop prospects"""
+
+def _check_blocked(events, bundle):
+    """Compliance blocks prospects whose contacts are suppressed"""
+    blocks = [e for e in events if e.get("type") == "policy_block"]
+    assert blocks, "Compliance should have blocked the prospect"
+    assert "email suppressed: " in blocks[0]["payload"]["reason"].lower()
+    assert bundle.store.called("check_suppressions")
+
+
+def _check_dropped(events, bundle):
+    """Low scores drop prospects"""
+    text = _event_text(events)
+    assert "dropped" in text or "low fit score" in text, "Should have found drop message"
+
+
+@pytest.mark.parametrize("company,suppress,check", [
+    pytest.param(HAPPY_COMPANY, None, _check_completed, id="happy_path"),
+    pytest.param(BLOCKED_COMPANY, _suppress_blocked, _check_blocked, id="compliance_block"),
+    pytest.param(LOW_SCORE_COMPANY, None, _check_dropped, id="scorer_drop"),
+])
+async def test_pipeline(company, suppress, check, mcp_bundle, run_pipeline, monkeypatch):
+    """Run one seed company through the pipeline and check its scenario's outcome"""
     
-    test_company = {
-        "id": "low-score",
-        "name": "Small Co",
-        "domain": "small.com",
-        "industry": "Unknown",  # Low value industry
-        "size": 10,  # Too small
-        "pains": [],  # No pains
-        "notes": []
-    }
+    _stub_downstream(mcp_bundle)
+    if suppress:
+        mcp_bundle.store.returns["check_suppression"] = suppress
+    
+    # Canned Ollama tokens: summary first, then the email
+    stream = _fake_stream(
+        ["• Test Co ", "needs better NPS"],
+        ["Subject: Lifting NPS at Test Co\n", "Body: Hi there,\n", "Worth a chat?"],
+    )
+    monkeypatch.setattr(Writer, '_stream_generate', stream)
+    events = await run_pipeline([company], retrieved=[{"text": "Relevant fact 1", "score": 0.9}])
     
-    with patch('builtins.open', mock_open(read_data=json.dumps([test_company]))):
-        with patch('app.orchestrator.MCPRegistry') as MockMCPRegistry:
-            mock_mcp = Mock()
-            MockMCPRegistry.return_value = mock_mcp
-            
-            mock_store = AsyncMock()
-            mock_store.save_prospect = AsyncMock(return_value=None)
-            mock_store.save_fact = AsyncMock(return_value=None)
-            mock_store.save_contact = AsyncMock(return_value=None)
-            mock_store.check_suppression = AsyncMock(return_value=False)
-            mock_store.list_contacts_by_domain = AsyncMock(return_value=[])
-            
-            mock_search = AsyncMock()
-            mock_search.query = AsyncMock(return_value=[])
-            
-            mock_email = AsyncMock()
-            mock_calendar = AsyncMock()
-            
-            mock_mcp.get_store_client.return_value = mock_store
-            mock_mcp.get_search_client.return_value = mock_search
-            mock_mcp.get_email_client.return_value = mock_email
-            mock_mcp.get_calendar_client.return_value = mock_calendar
-            
-            with patch.object(Path, 'exists', return_value=True):
-                with patch.object(Path, 'read_text', return_value="\n---\nTest Footer"):
-                    with patch('agents.writer.Retriever') as MockRetriever:
-                        mock_retriever = Mock()
-                        mock_retriever.retrieve.return_value = []
-                        MockRetriever.return_value = mock_retriever
-                        
-                        orchestrator = Orchestrator()
-                        
-                        events = []
-                        async for event in orchestrator.run_pipeline(["low-score"]):
-                            events.append(event)
-                        
-                        # Check for drop message in events
-                        found_drop = False
-                        for event in events:
-                            message = str(event.get("message", "")).lower()
-                            reason = str(event.get("payload", {}).get("reason", "")).lower()
-                            status = str(event.get("payload", {}).get("status", "")).lower()
-                            
-                            if "dropped" in message or "dropped" in reason or "dropped" in status or "low fit score" in message or "low fit score" in reason:
-                                found_drop = True
-                                break
-                        
-                        assert found_drop, f"Should have found drop message"
\ No newline at end of file
+    check(events, mcp_bundle)
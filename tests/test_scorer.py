@@ -0,0 +1,47 @@
+# file: tests/test_scorer.py
+from unittest.mock import patch
+from agents.scorer import Scorer
+
+async def test_prescore_drops_low_company_fit(mock_mcp, mock_store, make_company, make_prospect):
+    """Test that prescore drops prospects below the company-fields cutoff at the default thresholds"""
+
+    company = make_company(id="small", name="Small Co", domain="small.com", industry="Unknown", size=10)
+    prospect = make_prospect(id="small", company=company, status="new")
+
+    # Unknown industry, too small, no CX pains: company fields give 0.15
+    scorer = Scorer(mock_mcp)
+    result = await scorer.prescore(prospect)
+
+    assert result.status == "dropped"
+    assert "company fit" in result.dropped_reason.lower()
+    assert result.fit_score == 0
+    assert mock_store.save_prospect.called
+
+async def test_prescore_drops_unreachable_prospect(mock_mcp, mock_store, make_company, make_prospect):
+    """Test that prescore drops prospects whose best possible score is below threshold"""
+
+    company = make_company(id="small", name="Small Co", domain="small.com", industry="Unknown", size=10)
+    prospect = make_prospect(id="small", company=company, status="new")
+
+    # Company fields give 0.15; even perfect facts cannot reach 0.6
+    with patch("agents.scorer.PRESCORE_MIN", 0.0), patch("agents.scorer.MIN_FIT_SCORE", 0.6):
+        scorer = Scorer(mock_mcp)
+        result = await scorer.prescore(prospect)
+
+    assert result.status == "dropped"
+    assert "ceiling" in result.dropped_reason.lower()
+    # The ceiling is an upper bound, not a score; it only appears in the reason
+    assert result.fit_score == 0
+    assert mock_store.save_prospect.called
+
+async def test_prescore_keeps_reachable_prospect(mock_mcp, mock_store, make_company, make_prospect):
+    """Test that prescore leaves prospects that could still pass the full scorer"""
+
+    company = make_company(id="acme", name="Acme Corp", domain="acme.com", size=500, pains=["Low NPS scores"])
+    prospect = make_prospect(id="acme", company=company, status="new")
+
+    scorer = Scorer(mock_mcp)
+    result = await scorer.prescore(prospect)
+
+    assert result.status == "new"
+    assert not mock_store.save_prospect.called
@@ -0,0 +1,42 @@
+# file: tests/test_store_server.py
+import pytest
+from mcp.servers.store_server import StoreServer
+
+@pytest.fixture
+def store_server(tmp_path):
+    """Fresh StoreServer whose collections live in tmp_path"""
+    server = StoreServer()
+    server.data_dir = tmp_path
+    server.files = {name: tmp_path / path.name for name, path in server.files.items()}
+    server.prospects_file = server.files["prospects"]
+    server.companies_file = server.files["companies"]
+    return server
+
+async def test_save_contact_then_list_by_domain(store_server):
+    """Test that a contact saved on a fresh server is listed once for its domain"""
+    
+    contact = {"id": "c1", "name": "Ann", "email": "ann@Acme.com", "prospect_id": "acme"}
+    await store_server.dispatch("store.save_contact", {"contact": contact})
+    
+    response = await store_server.dispatch("store.list_contacts_by_domain", {"domain": "acme.com"})
+    
+    assert response["result"] == [contact]
+
+async def test_failed_flush_is_retried(store_server, monkeypatch):
+    """Test that a failed write keeps its collection pending and succeeds on the next flush"""
+    
+    fact = {"id": "f1", "text": "Acme is hiring", "company_id": "acme"}
+    await store_server.dispatch("store.save_facts", {"facts": [fact]})
+    
+    append_jsonl = store_server._append_jsonl
+    def fail_once(path, records):
+        monkeypatch.setattr(store_server, "_append_jsonl", append_jsonl)
+        raise OSError("disk full")
+    monkeypatch.setattr(store_server, "_append_jsonl", fail_once)
+    
+    await store_server._flush()
+    assert "facts" in store_server._dirty
+    
+    await store_server._flush()
+    assert not store_server._dirty
+    assert store_server.files["facts"].read_bytes().count(b"\n") == 1
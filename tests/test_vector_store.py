@@ -0,0 +1,24 @@
+# file: tests/test_vector_store.py
+import numpy as np
+import pytest
+from app.config import EMBEDDING_DIM
+from vector.store import VectorStore
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "sq8"])
+def test_search_filtered_by_company(tmp_path, monkeypatch, index_type):
+    """Test that a company-filtered search only returns that company's rows, for every index type"""
+    
+    monkeypatch.setattr("vector.store.VECTOR_INDEX_PATH", tmp_path / "faiss.index")
+    store = VectorStore(index_type=index_type)
+    
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((40, EMBEDDING_DIM)).astype(np.float32)
+    metadata = [{"company_id": "acme" if i % 4 == 0 else "other", "text": f"fact {i}"} for i in range(40)]
+    store.add(embeddings, metadata)
+    
+    results = store.search(embeddings[0], k=5, company_id="acme")
+    
+    assert len(results) == 5
+    assert all(r["company_id"] == "acme" for r in results)
+    assert results[0]["text"] == "fact 0"
+    assert store.search(embeddings[0], k=5, company_id="missing") == []
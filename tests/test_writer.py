@@ -0,0 +1,16 @@
+# file: tests/test_writer.py
+from agents.writer import _EMAIL_PARTS
+
+def test_email_parts_skip_preamble_and_keep_full_body():
+    """Test that text before Subject: is dropped and a repeated Body: stays in the body"""
+    
+    draft = "Here is your email:\nSubject: Lifting NPS\nBody: Hi team,\nBody: copy follows.\nThanks"
+    match = _EMAIL_PARTS.search(draft)
+    
+    assert match.group(1).strip() == "Lifting NPS"
+    assert match.group(2).strip() == "Hi team,\nBody: copy follows.\nThanks"
+
+def test_email_parts_need_subject_before_body():
+    """Test that a draft with Body: ahead of Subject: does not match (Writer uses its fallback)"""
+    
+    assert _EMAIL_PARTS.search("Body: Hi team\nSubject: Lifting NPS") is None
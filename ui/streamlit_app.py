@@ -1,10 +1,13 @@
 # file: ui/streamlit_app.py
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 from datetime import datetime
 import pandas as pd
 import time
+import queue
+import threading
 from collections import defaultdict
 import os
 
@@ -20,6 +23,12 @@ st.caption("Real-time agent orchestration with Ollama streaming and MCP integrat
 # Configure API base via environment; default to loopback
 API_BASE = os.environ.get("API_BASE", "http://127.0.0.1:8000")
 
+# Minimum seconds between streamed token re-renders
+RENDER_INTERVAL = 0.05
+
+# (connect, read) timeouts for streaming calls; read bounds the gap between chunks
+STREAM_TIMEOUT = (3, 60)
+
 # Initialize session state
 if "pipeline_logs" not in st.session_state:
     st.session_state.pipeline_logs = []
@@ -30,14 +39,96 @@ if "company_outputs" not in st.session_state:
 if "handoff_packets" not in st.session_state:
     st.session_state.handoff_packets = {}
 
+@st.cache_resource
+def get_session():
+    """One pooled HTTP session shared across reruns and API calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def iter_ndjson(response):
+    """Yield events from an NDJSON stream, one split per received chunk
+
+    chunk_size=None hands back whatever the server flushed (often several
+    events at once) without blocking for a fixed read size, so tokens still
+    render live.
+    """
+    pending = b""
+    for chunk in response.iter_content(chunk_size=None):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            if line:
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+    if pending.strip():
+        try:
+            yield orjson.loads(pending)
+        except orjson.JSONDecodeError:
+            pass
+
+def stream_events(response):
+    """Read an NDJSON response on a background thread and yield its events
+
+    The reader keeps draining the socket while the script thread is busy
+    rendering, so slow re-renders never stall the API stream.
+    """
+    events = queue.Queue()
+    done = object()
+
+    def reader():
+        try:
+            for event in iter_ndjson(response):
+                events.put(event)
+        except Exception as e:
+            events.put(e)
+        finally:
+            events.put(done)
+
+    threading.Thread(target=reader, daemon=True).start()
+    try:
+        while (item := events.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Also runs when a rerun abandons the loop; unblocks the reader
+        response.close()
+
+@st.cache_data
+def render_endpoints():
+    """API endpoint reference for the Dev Tools tab, rendered once"""
+    endpoints = [
+        ("GET /health", "System health check"),
+        ("POST /run", "Run full pipeline (streaming)"),
+        ("POST /writer/stream", "Test Writer streaming"),
+        ("GET /prospects", "List all prospects"),
+        ("GET /prospects/{id}", "Get prospect details"),
+        ("GET /handoff/{id}", "Get handoff packet"),
+        ("POST /reset", "Reset system")
+    ]
+    return "\n".join(f"{endpoint} - {desc}" for endpoint, desc in endpoints)
+
+@st.cache_data(ttl=5)
+def get_health():
+    """Fetch API health; cached so widget reruns don't each hit the API"""
+    return orjson.loads(get_session().get(f"{API_BASE}/health", timeout=8).content)
+
+@st.cache_data(ttl=3)
+def get_prospects():
+    """Fetch the prospect list; cleared explicitly by Refresh/Reset"""
+    return orjson.loads(get_session().get(f"{API_BASE}/prospects", timeout=5).content)
+
 # Sidebar
 with st.sidebar:
     st.header("System Status")
     
     # Health check
     try:
-        resp = requests.get(f"{API_BASE}/health", timeout=8)
-        health = resp.json()
+        health = get_health()
 
         if health.get("status") == "healthy":
             st.success("✅ System Healthy")
@@ -78,15 +169,17 @@ with st.sidebar:
         if st.button("🔄 Reset", help="Clear all data and reload"):
             with st.spinner("Resetting..."):
                 try:
-                    result = requests.post(f"{API_BASE}/reset").json()
+                    result = orjson.loads(get_session().post(f"{API_BASE}/reset").content)
                     st.success(f"✅ Reset: {result['companies_loaded']} companies")
                     st.session_state.company_outputs = {}
+                    get_prospects.clear()
                     st.rerun()
                 except Exception as e:
                     st.error(f"Reset failed: {e}")
     
     with col2:
         if st.button("🔍 Check", help="Verify system health"):
+            get_health.clear()
             st.rerun()
 
 # Main tabs
@@ -163,21 +256,37 @@ with tab1:
                 ids = [id.strip() for id in company_ids.split(",") if id.strip()]
             
             # Start streaming
-            response = requests.post(
+            response = get_session().post(
                 f"{API_BASE}/run",
                 json={"company_ids": ids},
                 stream=True,
-                timeout=60
+                timeout=STREAM_TIMEOUT
             )
             
-            # Initialize tracking variables
-            workflow_logs = []
+            # Initialize tracking variables; the workflow log is kept column-wise
+            log_time, log_agent, log_action, log_company, log_details = [], [], [], [], []
+            workflow_log = {
+                "⏰ Time": log_time,
+                "🤖 Agent": log_agent,
+                "📌 Action": log_action,
+                "🏢 Company": log_company,
+                "💬 Details": log_details,
+            }
             current_agent = None
             current_company = None
             agents_completed = set()
             total_agents = 8
-            company_outputs = defaultdict(lambda: {"summary": "", "email": "", "status": "processing"})
+            company_outputs = defaultdict(lambda: {"summary": [], "email": [], "status": "processing"})
             mcp_interactions = []
+            last_render = 0.0
+            content_pending = False
+            
+            def add_log(agent, action, company, details):
+                log_time.append(datetime.now().strftime("%H:%M:%S"))
+                log_agent.append(agent)
+                log_action.append(action)
+                log_company.append(company)
+                log_details.append(details)
             
             # Helper to render the accumulated content once per update
             def render_content():
@@ -189,11 +298,11 @@ with tab1:
                     lines.append(f"### 🏢 {company}\n")
                     # Summary
                     lines.append("**📝 Summary**")
-                    summary_text = outputs.get("final_summary") or outputs.get("summary") or ""
+                    summary_text = outputs.get("final_summary") or "".join(outputs["summary"])
                     lines.append(summary_text if summary_text else "_No summary yet_\n")
                     # Email
                     lines.append("**✉️ Email Draft**")
-                    email_val = outputs.get("final_email") or outputs.get("email") or ""
+                    email_val = outputs.get("final_email") or "".join(outputs["email"])
                     if isinstance(email_val, dict):
                         subj = email_val.get("subject", "")
                         body = email_val.get("body", "")
@@ -207,203 +316,167 @@ with tab1:
                 content_area.markdown("\n".join(lines))
             
             # Process stream
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        event = json.loads(line)
+            for event in stream_events(response):
+                try:
+                    # Track current company
+                    payload = event.get("payload", {})
+                    if payload.get("company_name"):
+                        current_company = payload["company_name"]
+                    elif payload.get("company"):
+                        current_company = payload["company"]
+                    elif payload.get("prospect", {}).get("company", {}).get("name"):
+                        current_company = payload["prospect"]["company"]["name"]
+                    
+                    # Update progress
+                    if event.get("agent"):
+                        current_agent = event["agent"]
+                        if event["type"] == "agent_end":
+                            agents_completed.add(current_agent)
+                            progress = len(agents_completed) / total_agents
+                            progress_bar.progress(progress, 
+                                text=f"Processing: {current_agent.title()} ({len(agents_completed)}/{total_agents})")
+                    
+                    # Handle different event types
+                    if event["type"] == "agent_start":
+                        add_log(event["agent"].title(), "▶️ Started", current_company or "All", event["message"])
+                        status_text.info(f"🔄 {event['agent'].title()}: {event['message']}")
+                    
+                    elif event["type"] == "mcp_call":
+                        mcp_server = event["payload"].get("mcp_server", "unknown")
+                        method = event["payload"].get("method", "unknown")
+                        add_log(current_agent.title() if current_agent else "System", "🔌 MCP Call", current_company or "All", f"→ {mcp_server.upper()}: {method}")
+                    
+                    elif event["type"] == "mcp_response":
+                        mcp_server = event["payload"].get("mcp_server", "unknown")
+                        add_log(current_agent.title() if current_agent else "System", "📥 MCP Response", current_company or "All", f"← {mcp_server.upper()}: {event['message']}")
+                    
+                    elif event["type"] == "agent_end":
+                        details = event["message"]
+                        if event.get("payload"):
+                            payload = event["payload"]
+                            extra = []
+                            if "facts_count" in payload:
+                                extra.append(f"Facts: {payload['facts_count']}")
+                            if "contacts_count" in payload:
+                                extra.append(f"Contacts: {payload['contacts_count']}")
+                            if "fit_score" in payload:
+                                extra.append(f"Score: {payload['fit_score']:.2f}")
+                            if "thread_id" in payload:
+                                extra.append(f"Thread: {payload['thread_id'][:8]}...")
+                            if extra:
+                                details += f" ({', '.join(extra)})"
                         
-                        # Track current company
+                        add_log(event["agent"].title(), "✅ Completed", current_company or "All", details)
+                    
+                    elif event["type"] == "company_start":
+                        company = event["payload"]["company"]
+                        industry = event["payload"].get("industry", "Unknown")
+                        size = event["payload"].get("size", 0)
+                        add_log("Writer", "🏢 Company", company, f"Starting: {company} ({industry}, {size} employees)")
+                    
+                    elif event["type"] == "llm_token":
                         payload = event.get("payload", {})
-                        if payload.get("company_name"):
-                            current_company = payload["company_name"]
-                        elif payload.get("company"):
-                            current_company = payload["company"]
-                        elif payload.get("prospect", {}).get("company", {}).get("name"):
-                            current_company = payload["prospect"]["company"]["name"]
-                        
-                        # Update progress
-                        if event.get("agent"):
-                            current_agent = event["agent"]
-                            if event["type"] == "agent_end":
-                                agents_completed.add(current_agent)
-                                progress = len(agents_completed) / total_agents
-                                progress_bar.progress(progress, 
-                                    text=f"Processing: {current_agent.title()} ({len(agents_completed)}/{total_agents})")
-                        
-                        # Handle different event types
-                        if event["type"] == "agent_start":
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": event["agent"].title(),
-                                "📌 Action": "▶️ Started",
-                                "🏢 Company": current_company or "All",
-                                "💬 Details": event["message"]
-                            })
-                            status_text.info(f"🔄 {event['agent'].title()}: {event['message']}")
-                        
-                        elif event["type"] == "mcp_call":
-                            mcp_server = event["payload"].get("mcp_server", "unknown")
-                            method = event["payload"].get("method", "unknown")
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": current_agent.title() if current_agent else "System",
-                                "📌 Action": f"🔌 MCP Call",
-                                "🏢 Company": current_company or "All",
-                                "💬 Details": f"→ {mcp_server.upper()}: {method}"
-                            })
-                        
-                        elif event["type"] == "mcp_response":
-                            mcp_server = event["payload"].get("mcp_server", "unknown")
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": current_agent.title() if current_agent else "System",
-                                "📌 Action": f"📥 MCP Response",
-                                "🏢 Company": current_company or "All",
-                                "💬 Details": f"← {mcp_server.upper()}: {event['message']}"
-                            })
-                        
-                        elif event["type"] == "agent_end":
-                            details = event["message"]
-                            if event.get("payload"):
-                                payload = event["payload"]
-                                extra = []
-                                if "facts_count" in payload:
-                                    extra.append(f"Facts: {payload['facts_count']}")
-                                if "contacts_count" in payload:
-                                    extra.append(f"Contacts: {payload['contacts_count']}")
-                                if "fit_score" in payload:
-                                    extra.append(f"Score: {payload['fit_score']:.2f}")
-                                if "thread_id" in payload:
-                                    extra.append(f"Thread: {payload['thread_id'][:8]}...")
-                                if extra:
-                                    details += f" ({', '.join(extra)})"
-                            
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": event["agent"].title(),
-                                "📌 Action": "✅ Completed",
-                                "🏢 Company": current_company or "All",
-                                "💬 Details": details
-                            })
-                        
-                        elif event["type"] == "company_start":
-                            company = event["payload"]["company"]
-                            industry = event["payload"].get("industry", "Unknown")
-                            size = event["payload"].get("size", 0)
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": "Writer",
-                                "📌 Action": "🏢 Company",
-                                "🏢 Company": company,
-                                "💬 Details": f"Starting: {company} ({industry}, {size} employees)"
-                            })
-                        
-                        elif event["type"] == "llm_token":
-                            payload = event.get("payload", {})
-                            token = payload.get("token", "")
-                            token_type = payload.get("type", "")
-                            company = payload.get("company_name") or payload.get("company") or current_company
+                        token = payload.get("token", "")
+                        token_type = payload.get("type", "")
+                        company = payload.get("company_name") or payload.get("company") or current_company
 
-                            if company and display_mode != "Summary Only":
-                                if token_type == "summary":
-                                    company_outputs[company]["summary"] += token
-                                elif token_type == "email":
-                                    company_outputs[company]["email"] += token
-                                # Update the single content area
-                                render_content()
-                        
-                        elif event["type"] == "llm_done":
-                            payload = event.get("payload", {})
-                            company = payload.get("company_name") or payload.get("company") or current_company
-                            if company:
-                                company_outputs[company]["status"] = "completed"
-                                if "summary" in payload:
-                                    company_outputs[company]["final_summary"] = payload["summary"]
-                                if "email" in payload:
-                                    company_outputs[company]["final_email"] = payload["email"]
-                                render_content()
-                            
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": "Writer",
-                                "📌 Action": "✅ Generated",
-                                "🏢 Company": company or "Unknown",
-                                "💬 Details": "Content generation complete"
-                            })
-                        
-                        elif event["type"] == "policy_block":
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": "Compliance",
-                                "📌 Action": "❌ Blocked",
-                                "🏢 Company": current_company or "Unknown",
-                                "💬 Details": event["payload"].get("reason", "Policy violation")
-                            })
-                        
-                        elif event["type"] == "policy_pass":
-                            workflow_logs.append({
-                                "⏰ Time": datetime.now().strftime("%H:%M:%S"),
-                                "🤖 Agent": "Compliance",
-                                "📌 Action": "✅ Passed",
-                                "🏢 Company": current_company or "Unknown",
-                                "💬 Details": "All compliance checks passed"
-                            })
-                        
-                        # Update displays based on mode
-                        if display_mode == "Complete Workflow":
-                            # Update workflow display
-                            if workflow_logs:
-                                df = pd.DataFrame(workflow_logs[-50:])  # Show last 50 entries
-                                workflow_display.dataframe(
-                                    df,
-                                    use_container_width=True,
-                                    hide_index=True,
-                                    height=400
-                                )
-                            # Content display handled by render_content()
-                        
-                        elif display_mode == "Content Only":
-                            # Content display handled by render_content()
-                            pass
+                        if company and display_mode != "Summary Only":
+                            if token_type == "summary":
+                                company_outputs[company]["summary"].append(token)
+                            elif token_type == "email":
+                                company_outputs[company]["email"].append(token)
+                            content_pending = True
+                    
+                    elif event["type"] == "llm_done":
+                        payload = event.get("payload", {})
+                        company = payload.get("company_name") or payload.get("company") or current_company
+                        if company:
+                            company_outputs[company]["status"] = "completed"
+                            if "summary" in payload:
+                                company_outputs[company]["final_summary"] = payload["summary"]
+                            if "email" in payload:
+                                company_outputs[company]["final_email"] = payload["email"]
+                            content_pending = True
                         
-                        else:  # Summary Only
-                            # Show high-level statistics
-                            summary_stats = {
-                                "Total Events": len(workflow_logs),
-                                "Agents Run": len(agents_completed),
-                                "Companies Processed": len(set(log.get("🏢 Company", "Unknown") for log in workflow_logs if log.get("🏢 Company") != "All")),
-                                "MCP Calls": len([log for log in workflow_logs if "MCP Call" in log.get("📌 Action", "")]),
-                                "MCP Responses": len([log for log in workflow_logs if "MCP Response" in log.get("📌 Action", "")]),
-                                "Current Agent": current_agent.title() if current_agent else "None",
-                                "Current Company": current_company or "None"
-                            }
-                            summary_container.json(summary_stats)
+                        add_log("Writer", "✅ Generated", company or "Unknown", "Content generation complete")
+                    
+                    elif event["type"] == "policy_block":
+                        add_log("Compliance", "❌ Blocked", current_company or "Unknown", event["payload"].get("reason", "Policy violation"))
                     
-                    except json.JSONDecodeError:
+                    elif event["type"] == "policy_pass":
+                        add_log("Compliance", "✅ Passed", current_company or "Unknown", "All compliance checks passed")
+                    
+                    # Coalesce token bursts into one re-render per interval
+                    now = time.monotonic()
+                    if event["type"] == "llm_token" and now - last_render < RENDER_INTERVAL:
                         continue
-                    except Exception as e:
-                        st.error(f"Error processing event: {e}")
+                    last_render = now
+                    if content_pending:
+                        render_content()
+                        content_pending = False
+                    
+                    # Update displays based on mode
+                    if display_mode == "Complete Workflow":
+                        # Update workflow display
+                        if log_time:
+                            # Show last 50 entries
+                            df = pd.DataFrame({col: values[-50:] for col, values in workflow_log.items()})
+                            workflow_display.dataframe(
+                                df,
+                                use_container_width=True,
+                                hide_index=True,
+                                height=400
+                            )
+                        # Content display handled by render_content()
+                    
+                    elif display_mode == "Content Only":
+                        # Content display handled by render_content()
+                        pass
+                    
+                    else:  # Summary Only
+                        # Show high-level statistics
+                        summary_stats = {
+                            "Total Events": len(log_time),
+                            "Agents Run": len(agents_completed),
+                            "Companies Processed": len(set(c for c in log_company if c != "All")),
+                            "MCP Calls": sum("MCP Call" in a for a in log_action),
+                            "MCP Responses": sum("MCP Response" in a for a in log_action),
+                            "Current Agent": current_agent.title() if current_agent else "None",
+                            "Current Company": current_company or "None"
+                        }
+                        summary_container.json(summary_stats)
+                
+                except Exception as e:
+                    st.error(f"Error processing event: {e}")
+            
+            if content_pending:
+                render_content()
             
             # Pipeline complete
             progress_bar.progress(1.0, text="✅ Pipeline Complete!")
             status_text.success("✅ Pipeline execution completed successfully!")
             
             # Store outputs in session state
-            st.session_state.pipeline_logs = workflow_logs
-            st.session_state.company_outputs = dict(company_outputs)
+            workflow_df = pd.DataFrame(workflow_log)
+            st.session_state.pipeline_logs = workflow_df
+            st.session_state.company_outputs = {
+                company: {**outputs, "summary": "".join(outputs["summary"]), "email": "".join(outputs["email"])}
+                for company, outputs in company_outputs.items()
+            }
+            get_prospects.clear()
             
             # Show final summary
             st.divider()
             st.subheader("📊 Execution Summary")
             
             # Calculate statistics
-            companies_processed = set(log.get("🏢 Company", "Unknown") for log in workflow_logs if log.get("🏢 Company") not in ["All", None])
-            mcp_calls = [log for log in workflow_logs if "MCP Call" in log.get("📌 Action", "")]
-            mcp_responses = [log for log in workflow_logs if "MCP Response" in log.get("📌 Action", "")]
+            companies_processed = set(c for c in log_company if c not in ["All", None])
+            mcp_calls = [a for a in log_action if "MCP Call" in a]
+            mcp_responses = [a for a in log_action if "MCP Response" in a]
             
             col1, col2, col3, col4, col5 = st.columns(5)
             with col1:
-                st.metric("Total Events", len(workflow_logs))
+                st.metric("Total Events", len(workflow_df))
             with col2:
                 st.metric("Companies", len(companies_processed))
             with col3:
@@ -417,9 +490,8 @@ with tab1:
             if mcp_calls or mcp_responses:
                 with st.expander("🔌 MCP Server Interactions"):
                     mcp_servers = defaultdict(int)
-                    for log in workflow_logs:
-                        if "MCP" in log.get("📌 Action", ""):
-                            details = log.get("💬 Details", "")
+                    for action, details in zip(log_action, log_details):
+                        if "MCP" in action:
                             for server in ["STORE", "SEARCH", "EMAIL", "CALENDAR", "VECTOR", "OLLAMA"]:
                                 if server in details.upper():
                                     mcp_servers[server] += 1
@@ -484,12 +556,15 @@ with tab2:
     col1, col2 = st.columns([6, 1])
     with col2:
         if st.button("🔄 Refresh", use_container_width=True):
+            get_prospects.clear()
             st.rerun()
     
     try:
-        prospects_data = requests.get(f"{API_BASE}/prospects").json()
+        prospects_data = get_prospects()
         
         if prospects_data["count"] > 0:
+            prospects_df = pd.DataFrame(prospects_data["prospects"])
+            
             # Metrics row
             col1, col2, col3, col4 = st.columns(4)
             
@@ -497,24 +572,22 @@ with tab2:
                 st.metric("Total Prospects", prospects_data["count"])
             
             with col2:
-                ready = sum(1 for p in prospects_data["prospects"] 
-                           if p["status"] == "ready_for_handoff")
+                ready = int((prospects_df["status"] == "ready_for_handoff").sum())
                 st.metric("Ready for Handoff", ready)
             
             with col3:
-                blocked = sum(1 for p in prospects_data["prospects"] 
-                             if p["status"] in ["blocked", "dropped"])
+                blocked = int(prospects_df["status"].isin(["blocked", "dropped"]).sum())
                 st.metric("Blocked/Dropped", blocked)
             
             with col4:
-                scores = [p["fit_score"] for p in prospects_data["prospects"] if p["fit_score"] > 0]
-                avg_score = sum(scores) / len(scores) if scores else 0
+                scores = prospects_df["fit_score"]
+                scored = scores[scores > 0]
+                avg_score = float(scored.mean()) if len(scored) else 0.0
                 st.metric("Avg Fit Score", f"{avg_score:.2f}")
             
             st.divider()
             
             # Prospect table with enhanced status display
-            prospects_df = pd.DataFrame(prospects_data["prospects"])
             
             # Status mapping with colors and descriptions
             status_info = {
@@ -530,23 +603,21 @@ with tab2:
                 "blocked": ("🚫", "Blocked", "Failed requirements")
             }
             
-            # Format the dataframe
-            display_data = []
-            for _, row in prospects_df.iterrows():
-                status = row["status"]
-                icon, label, desc = status_info.get(status, ("❓", status, "Unknown"))
-                
-                display_data.append({
-                    "Company": row["company"],
-                    "Status": f"{icon} {label}",
-                    "Description": desc,
-                    "Fit Score": f"{row['fit_score']:.2f}" if row['fit_score'] > 0 else "N/A",
-                    "Contacts": row["contacts"],
-                    "Facts": row["facts"],
-                    "ID": row["id"]
-                })
+            # Format the dataframe column-wise
+            status = prospects_df["status"]
+            fit_score = prospects_df["fit_score"]
+            status_label = status.map({key: f"{icon} {label}" for key, (icon, label, _) in status_info.items()})
+            status_desc = status.map({key: desc for key, (_, _, desc) in status_info.items()})
             
-            display_df = pd.DataFrame(display_data)
+            display_df = pd.DataFrame({
+                "Company": prospects_df["company"],
+                "Status": status_label.fillna("❓ " + status),
+                "Description": status_desc.fillna("Unknown"),
+                "Fit Score": fit_score.map("{:.2f}".format).where(fit_score > 0, "N/A"),
+                "Contacts": prospects_df["contacts"],
+                "Facts": prospects_df["facts"],
+                "ID": prospects_df["id"]
+            })
             
             # Show the table
             st.dataframe(
@@ -590,7 +661,7 @@ with tab3:
     
     if prospect_id and (search_btn or st.session_state.current_prospect):
         try:
-            data = requests.get(f"{API_BASE}/prospects/{prospect_id}", timeout=10).json()
+            data = orjson.loads(get_session().get(f"{API_BASE}/prospects/{prospect_id}", timeout=10).content)
             
             if "error" not in data:
                 prospect = data["prospect"]
@@ -632,14 +703,14 @@ with tab3:
                 handoff = st.session_state.handoff_packets.get(prospect_id)
                 if st.button("Get Handoff Packet", key=f"handoff_{prospect_id}"):
                     try:
-                        resp_h = requests.get(f"{API_BASE}/handoff/{prospect_id}", timeout=15)
+                        resp_h = get_session().get(f"{API_BASE}/handoff/{prospect_id}", timeout=15)
                         if resp_h.status_code == 200:
-                            handoff = resp_h.json()
+                            handoff = orjson.loads(resp_h.content)
                             st.session_state.handoff_packets[prospect_id] = handoff
                         else:
                             # Surface API error detail
                             try:
-                                detail = resp_h.json().get("detail")
+                                detail = orjson.loads(resp_h.content).get("detail")
                             except Exception:
                                 detail = resp_h.text
                             st.warning(f"Handoff not available: {detail}")
@@ -674,42 +745,41 @@ with tab4:
         with st.spinner("Streaming from Writer agent..."):
             
             output_container = st.empty()
-            full_text = ""
+            text_buf = []
+            last_render = 0.0
             
             try:
-                response = requests.post(
+                response = get_session().post(
                     f"{API_BASE}/writer/stream",
                     json={"company_id": test_company_id},
-                    stream=True
+                    stream=True,
+                    timeout=STREAM_TIMEOUT
                 )
                 
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            event = json.loads(line)
-                            
-                            if event.get("type") == "llm_token":
-                                token = event["payload"].get("token", "")
-                                full_text += token
-                                output_container.markdown(full_text)
-                            
-                            elif event.get("type") == "llm_done":
-                                st.success("✅ Generation complete")
-                                
-                                # Show final artifacts
-                                if "summary" in event["payload"]:
-                                    with st.expander("Final Summary"):
-                                        st.markdown(event["payload"]["summary"])
-                                
-                                if "email" in event["payload"]:
-                                    with st.expander("Final Email"):
-                                        email = event["payload"]["email"]
-                                        st.write(f"**Subject:** {email.get('subject', '')}")
-                                        st.markdown(email.get("body", ""))
+                for event in stream_events(response):
+                    if event.get("type") == "llm_token":
+                        token = event["payload"].get("token", "")
+                        text_buf.append(token)
+                        now = time.monotonic()
+                        if now - last_render >= RENDER_INTERVAL:
+                            output_container.markdown("".join(text_buf))
+                            last_render = now
+                    
+                    elif event.get("type") == "llm_done":
+                        output_container.markdown("".join(text_buf))
+                        st.success("✅ Generation complete")
                         
-                        except json.JSONDecodeError:
-                            continue
-            
+                        # Show final artifacts
+                        if "summary" in event["payload"]:
+                            with st.expander("Final Summary"):
+                                st.markdown(event["payload"]["summary"])
+                        
+                        if "email" in event["payload"]:
+                            with st.expander("Final Email"):
+                                email = event["payload"]["email"]
+                                st.write(f"**Subject:** {email.get('subject', '')}")
+                                st.markdown(email.get("body", ""))
+                    
             except Exception as e:
                 st.error(f"Stream test failed: {e}")
     
@@ -717,15 +787,4 @@ with tab4:
     
     st.subheader("📡 API Endpoints")
     
-    endpoints = [
-        ("GET /health", "System health check"),
-        ("POST /run", "Run full pipeline (streaming)"),
-        ("POST /writer/stream", "Test Writer streaming"),
-        ("GET /prospects", "List all prospects"),
-        ("GET /prospects/{id}", "Get prospect details"),
-        ("GET /handoff/{id}", "Get handoff packet"),
-        ("POST /reset", "Reset system")
-    ]
-    
-    for endpoint, desc in endpoints:
-        st.code(f"{endpoint} - {desc}")
+    st.code(render_endpoints())
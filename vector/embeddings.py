@@ -1,14 +1,80 @@
 # file: vector/embeddings.py
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from sentence_transformers import SentenceTransformer
 import numpy as np
-from app.config import EMBEDDING_MODEL, EMBEDDING_DIM
+from app.config import EMBEDDING_MODEL, EMBEDDING_DIM, EMBEDDING_CACHE_PATH, EMBEDDING_BATCH_SIZE
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache keyed by (model, sha256(text))"""
+    
+    # Keep IN (...) lookups under SQLite's bound-parameter limit
+    QUERY_BATCH = 500
+    # In-process LRU in front of SQLite for repeated texts
+    MEMORY_SIZE = 4096
+    
+    def __init__(self, path, model_name: str):
+        self.model_name = model_name
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS emb (k BLOB PRIMARY KEY, v BLOB)")
+        self.conn.commit()
+    
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode()).digest()
+    
+    def _remember(self, key: bytes, embedding):
+        self.memory[key] = embedding
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.MEMORY_SIZE:
+            self.memory.popitem(last=False)
+    
+    def get_many(self, texts) -> dict:
+        """Return {index: embedding} for the texts already cached"""
+        keys = [self._key(t) for t in texts]
+        found = {}
+        with self.lock:
+            for k in keys:
+                if k in self.memory:
+                    self.memory.move_to_end(k)
+                    found[k] = self.memory[k]
+            
+            misses = list({k for k in keys if k not in found})
+            for start in range(0, len(misses), self.QUERY_BATCH):
+                batch = misses[start:start + self.QUERY_BATCH]
+                rows = self.conn.execute(
+                    f"SELECT k, v FROM emb WHERE k IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for k, v in rows:
+                    found[k] = np.frombuffer(v, dtype=np.float32)
+                    self._remember(k, found[k])
+        return {i: found[k] for i, k in enumerate(keys) if k in found}
+    
+    def put_many(self, texts, embeddings):
+        """Store float32 embeddings for the given texts"""
+        rows = [
+            (self._key(t), np.asarray(e, dtype=np.float32).tobytes())
+            for t, e in zip(texts, embeddings)
+        ]
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO emb (k, v) VALUES (?, ?)", rows)
+            self.conn.commit()
+            for k, v in rows:
+                self._remember(k, np.frombuffer(v, dtype=np.float32))
 
 class EmbeddingModel:
     """Manages sentence transformer embeddings"""
     
     def __init__(self):
         self.model = None
+        self.cache = None
         self._load_model()
+        self._open_cache()
     
     def _load_model(self):
         """Load the embedding model"""
@@ -19,11 +85,49 @@ class EmbeddingModel:
             # Fallback to random embeddings for testing
             self.model = None
     
+    def _open_cache(self):
+        """Open the on-disk embedding cache (disabled when the path is empty)"""
+        if not self.model or not EMBEDDING_CACHE_PATH:
+            return
+        try:
+            self.cache = EmbeddingCache(EMBEDDING_CACHE_PATH, EMBEDDING_MODEL)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not open embedding cache: {e}")
+            self.cache = None
+    
+    def _encode_batch(self, texts):
+        """Encode texts with the model in one batched call, encoding each distinct text once"""
+        unique = list(dict.fromkeys(texts))
+        embeddings = self.model.encode(
+            unique,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+        if len(unique) == len(texts):
+            return embeddings
+        
+        # sentence-transformers already length-sorts within the call; just fan out duplicates
+        position = {text: i for i, text in enumerate(unique)}
+        return embeddings[[position[t] for t in texts]]
+    
     def encode(self, texts):
         """Encode texts to embeddings"""
         if self.model:
-            embeddings = self.model.encode(texts, normalize_embeddings=True)
-            return embeddings
+            if not self.cache or not len(texts):
+                return self._encode_batch(texts)
+            
+            # Only encode texts missing from the cache
+            cached = self.cache.get_many(texts)
+            missing = [i for i in range(len(texts)) if i not in cached]
+            if missing:
+                missing_texts = [texts[i] for i in missing]
+                new = self._encode_batch(missing_texts)
+                self.cache.put_many(missing_texts, new)
+                cached.update(zip(missing, new))
+            
+            # Cached and fresh vectors are both float32 already; avoid a second copy
+            return np.stack([cached[i] for i in range(len(texts))]).astype(np.float32, copy=False)
         else:
             # Fallback: random embeddings
             return np.random.randn(len(texts), EMBEDDING_DIM).astype(np.float32)
@@ -35,4 +139,4 @@ def get_embedding_model():
     global _embedding_model
     if _embedding_model is None:
         _embedding_model = EmbeddingModel()
-    return _embedding_model
\ No newline at end of file
+    return _embedding_model
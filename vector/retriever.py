@@ -1,39 +1,53 @@
 # file: vector/retriever.py
+import time
 from typing import List, Dict
 from vector.store import VectorStore
 from vector.embeddings import get_embedding_model
 
+# Seconds a company's query embedding is reused between retrievals
+QUERY_CACHE_TTL = 300
+
 class Retriever:
     """Retrieves relevant facts from vector store"""
     
-    def __init__(self):
-        self.store = VectorStore()
-        self.embedding_model = get_embedding_model()
+    def __init__(self, store: VectorStore = None, model=None):
+        # Callers that already hold a loaded store/model can pass them in
+        self.store = store or VectorStore()
+        self.embedding_model = model or get_embedding_model()
+        self._query_cache = {}  # company_id -> (embedding, encoded_at)
     
-    def retrieve(self, company_id: str, k: int = 5) -> List[Dict]:
-        """Retrieve relevant facts for a company"""
+    def _query_embedding(self, company_id: str):
+        """Encode the retrieval query for a company, reusing a recent encoding"""
+        cached = self._query_cache.get(company_id)
+        if cached and time.time() - cached[1] < QUERY_CACHE_TTL:
+            return cached[0]
         
         # Build query
         query = f"customer experience insights for company {company_id}"
         
         # Encode query
         query_embedding = self.embedding_model.encode([query])[0]
+        self._query_cache[company_id] = (query_embedding, time.time())
+        return query_embedding
+    
+    def retrieve(self, company_id: str, k: int = 5) -> List[Dict]:
+        """Retrieve relevant facts for a company"""
+        
+        # Nothing indexed yet: skip encoding a query that cannot match anything
+        if not self.store.is_initialized():
+            return []
         
-        # Search
-        results = self.store.search(query_embedding, k=k*2)  # Get more, filter later
+        query_embedding = self._query_embedding(company_id)
         
-        # Filter by company
-        company_results = [
-            r for r in results 
-            if r.get("company_id") == company_id
-        ]
+        # Search this company's rows first
+        company_results = self.store.search(query_embedding, k=k, company_id=company_id)
         
         # If not enough company-specific, include general
         if len(company_results) < k:
-            for r in results:
-                if r not in company_results:
-                    company_results.append(r)
+            for r in self.store.search(query_embedding, k=k*2):
                 if len(company_results) >= k:
                     break
+                if r.get("company_id") != company_id:
+                    company_results.append(r)
         
         return company_results[:k]
\ No newline at end of file
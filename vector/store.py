@@ -4,16 +4,23 @@ import pickle
 from pathlib import Path
 import numpy as np
 import faiss
-from app.config import VECTOR_INDEX_PATH, EMBEDDING_DIM, DATA_DIR
+from app.config import (
+    VECTOR_INDEX_PATH, VECTOR_INDEX_TYPE, HNSW_M, HNSW_EF_SEARCH,
+    EMBEDDING_DIM, DATA_DIR
+)
 
 class VectorStore:
     """FAISS vector store with persistence"""
     
-    def __init__(self):
+    def __init__(self, index_type: str = None):
+        # Index built when none exists on disk: flat | hnsw | sq8 (default VECTOR_INDEX_TYPE)
+        self.index_type = (index_type or VECTOR_INDEX_TYPE).lower()
         self.index_path = Path(VECTOR_INDEX_PATH)
         self.metadata_path = self.index_path.with_suffix(".meta")
         self.index = None
         self.metadata = []
+        # Column index over metadata: company_id -> row ids in the FAISS index
+        self.rows_by_company = {}
         self._initialize()
     
     def _initialize(self):
@@ -25,22 +32,44 @@ class VectorStore:
     
     def _create_new(self):
         """Create a new FAISS index"""
-        # Using IndexFlatIP for inner product (cosine with normalized vectors)
-        self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
+        if self.index_type == "hnsw":
+            # HNSW graph over inner product; approximate but sublinear search
+            self.index = faiss.IndexHNSWFlat(EMBEDDING_DIM, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            self.index.hnsw.efSearch = HNSW_EF_SEARCH
+        elif self.index_type == "sq8":
+            # int8 scalar quantization: 4x smaller vectors, trained on the first batch added
+            self.index = faiss.IndexScalarQuantizer(
+                EMBEDDING_DIM, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+        else:
+            # Using IndexFlatIP for inner product (cosine with normalized vectors)
+            self.index = faiss.IndexFlatIP(EMBEDDING_DIM)
         self.metadata = []
+        self.rows_by_company = {}
     
     def _load(self):
         """Load existing index and metadata"""
         try:
             self.index = faiss.read_index(str(self.index_path))
+            # efSearch is a runtime parameter and is not persisted
+            if isinstance(self.index, faiss.IndexHNSW):
+                self.index.hnsw.efSearch = HNSW_EF_SEARCH
             
             if self.metadata_path.exists():
                 with open(self.metadata_path, "rb") as f:
                     self.metadata = pickle.load(f)
+            
+            self.rows_by_company = {}
+            self._index_rows(0)
         except Exception as e:
             print(f"Could not load index: {e}")
             self._create_new()
     
+    def _index_rows(self, start: int):
+        """Record company row ids for metadata from position start onward"""
+        for row, meta in enumerate(self.metadata[start:], start):
+            self.rows_by_company.setdefault(meta.get("company_id"), []).append(row)
+    
     def save(self):
         """Persist index and metadata"""
         if self.index:
@@ -55,32 +84,50 @@ class VectorStore:
         if self.index is None:
             self._create_new()
         
-        # Normalize embeddings for cosine similarity
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        normalized = embeddings / (norms + 1e-10)
+        # Normalize embeddings for cosine similarity (in place on a float32 copy)
+        normalized = np.array(embeddings, dtype=np.float32, order="C")
+        faiss.normalize_L2(normalized)
         
-        self.index.add(normalized.astype(np.float32))
+        if not self.index.is_trained:
+            self.index.train(normalized)
+        
+        start = len(self.metadata)
+        self.index.add(normalized)
         self.metadata.extend(metadata)
+        self._index_rows(start)
         self.save()
     
-    def search(self, query_embedding: np.ndarray, k: int = 5):
-        """Search for similar vectors"""
+    def search(self, query_embedding: np.ndarray, k: int = 5, company_id: str = None):
+        """Search for similar vectors, optionally restricted to one company's rows"""
         if self.index is None or self.index.ntotal == 0:
             return []
         
+        # Restrict the scan to the company's rows instead of filtering hits afterwards
+        params = None
+        limit = self.index.ntotal
+        if company_id is not None:
+            rows = self.rows_by_company.get(company_id)
+            if not rows:
+                return []
+            selector = faiss.IDSelectorBatch(np.array(rows, dtype=np.int64))
+            if isinstance(self.index, faiss.IndexHNSW):
+                # HNSW only accepts its own parameter type (efSearch is per-call there)
+                params = faiss.SearchParametersHNSW(sel=selector, efSearch=HNSW_EF_SEARCH)
+            else:
+                params = faiss.SearchParameters(sel=selector)
+            limit = len(rows)
+        
         # Normalize query
-        norm = np.linalg.norm(query_embedding)
-        normalized = query_embedding / (norm + 1e-10)
+        normalized = np.array(query_embedding, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(normalized)
         
         # Search
-        scores, indices = self.index.search(
-            normalized.reshape(1, -1).astype(np.float32), 
-            min(k, self.index.ntotal)
-        )
+        scores, indices = self.index.search(normalized, min(k, limit), params=params)
         
         results = []
         for score, idx in zip(scores[0], indices[0]):
-            if idx < len(self.metadata):
+            # Approximate indexes pad short result lists with -1
+            if 0 <= idx < len(self.metadata):
                 result = self.metadata[idx].copy()
                 result["score"] = float(score)
                 results.append(result)
@@ -100,13 +147,11 @@ class VectorStore:
             from vector.embeddings import get_embedding_model
             model = get_embedding_model()
             
-            texts = []
             metadata = []
             
             for company in companies:
                 # Add company description
                 desc = f"{company['name']} is a {company['industry']} company with {company['size']} employees"
-                texts.append(desc)
                 metadata.append({
                     "company_id": company["id"],
                     "type": "description",
@@ -116,7 +161,6 @@ class VectorStore:
                 # Add pain points
                 for pain in company.get("pains", []):
                     text = f"{company['name']} pain point: {pain}"
-                    texts.append(text)
                     metadata.append({
                         "company_id": company["id"],
                         "type": "pain",
@@ -125,13 +169,14 @@ class VectorStore:
                 
                 # Add notes
                 for note in company.get("notes", []):
-                    texts.append(note)
                     metadata.append({
                         "company_id": company["id"],
                         "type": "note",
                         "text": note
                     })
             
+            # Texts live in the metadata; encode them in one batch
+            texts = [m["text"] for m in metadata]
             if texts:
                 embeddings = model.encode(texts)
                 self.add(embeddings, metadata)